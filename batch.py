@@ -0,0 +1,145 @@
+"""Resolución por lotes sin interfaz gráfica.
+
+Lee sudokus de n² caracteres por línea (81 en 9x9), de un fichero o de stdin, y
+escribe un resultado JSON por línea a medida que cada puzzle termina:
+
+    python batch.py puzzles.txt --workers 4 --order completion > results.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import sys
+import numpy as np
+from config import Config
+from solve import run_solver
+from solution_cache import SolutionCache
+from sudoku import Sudoku, parse_board
+
+_worker_config = None
+_worker_cache = None
+
+def init_worker(config):
+    """Inicializa cada proceso del pool con la configuración (y su conexión a la caché)"""
+    global _worker_config, _worker_cache
+    _worker_config = config
+    if config.SOLUTION_CACHE_PATH:
+        _worker_cache = SolutionCache(config.SOLUTION_CACHE_PATH)
+
+def puzzle_rng(seed, index):
+    """Generador independiente por puzzle: el resultado no depende del proceso que lo resuelva"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+def solve_puzzle(index, line):
+    """Resuelve un puzzle y devuelve su resultado como diccionario"""
+    result = {'index': index, 'puzzle': line.strip()}
+    try:
+        result.update(run_solver(Sudoku(parse_board(line)), _worker_config, _worker_cache,
+                                 rng=puzzle_rng(_worker_config.SEED, index)))
+    except Exception as e:
+        # Un puzzle inválido no debe detener el lote
+        result['error'] = str(e)
+    return result
+
+def read_puzzles(stream):
+    """Genera las líneas no vacías de la entrada sin cargarla entera en memoria"""
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+def run_batch(puzzles, output, config, workers=None, order='input', window=None):
+    """Reparte los puzzles entre un pool de procesos y escribe los resultados en JSONL.
+    
+    Como mucho hay window puzzles leídos y sin escribir, de modo que la memoria
+    no crece con el tamaño de la entrada. Con order='input' los resultados se
+    escriben en el orden de entrada; con order='completion', según terminan.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    window = window or workers * 4
+    finished = queue.Queue()
+    buffered = {}
+    submitted = written = 0
+    
+    def write_next():
+        nonlocal written
+        result = finished.get()
+        if order == 'completion':
+            output.write(json.dumps(result) + '\n')
+            written += 1
+        else:
+            buffered[result['index']] = result
+            while written in buffered:
+                output.write(json.dumps(buffered.pop(written)) + '\n')
+                written += 1
+        output.flush()
+    
+    def failed(index, line):
+        # Lo que escapa de solve_puzzle (la caché, el envío del resultado...) también cuenta como
+        # resultado: sin él, write_next esperaría para siempre
+        return lambda error: finished.put({'index': index, 'puzzle': line.strip(), 'error': str(error)})
+    
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=(config,)) as pool:
+        for index, line in enumerate(puzzles):
+            while submitted - written >= window:
+                write_next()
+            pool.apply_async(solve_puzzle, (index, line), callback=finished.put,
+                             error_callback=failed(index, line))
+            submitted += 1
+        
+        while written < submitted:
+            write_next()
+    
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve sudokus por lotes con el algoritmo genético")
+    parser.add_argument('input', nargs='?', default='-', help="Fichero con un puzzle por línea ('-' para stdin)")
+    parser.add_argument('-o', '--output', default='-', help="Fichero JSONL de salida ('-' para stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Procesos en paralelo")
+    parser.add_argument('--order', choices=['input', 'completion'], default='input',
+                        help="Orden de los resultados: de entrada o de finalización")
+    parser.add_argument('--window', type=int, default=None, help="Máximo de puzzles en vuelo")
+    parser.add_argument('--population', type=int, default=Config.POPULATION_SIZE)
+    parser.add_argument('--generations', type=int, default=Config.GENERATIONS)
+    parser.add_argument('--mutation-rate', type=float, default=Config.MUTATION_RATE)
+    parser.add_argument('--elite', type=int, default=Config.ELITE_SIZE)
+    parser.add_argument('--array', action='store_true', help="Usar la población en modo array")
+    parser.add_argument('--solver', choices=['ga', 'exact', 'hybrid'], default=Config.SOLVER,
+                        help="Motor: algoritmo genético, backtracking exacto o ambos")
+    parser.add_argument('--hybrid-mode', choices=['race', 'fallback'], default=Config.HYBRID_MODE)
+    parser.add_argument('--restarts', choices=['luby', 'geometric'], default=None,
+                        help="Reinicios programados; --generations pasa a ser el presupuesto total")
+    parser.add_argument('--seed', type=int, default=None, help="Semilla para resultados reproducibles")
+    parser.add_argument('--cache', default=Config.SOLUTION_CACHE_PATH,
+                        help="Fichero SQLite de soluciones ya encontradas (también para puzzles equivalentes)")
+    args = parser.parse_args(argv)
+    
+    config = Config()
+    config.POPULATION_SIZE = args.population
+    config.GENERATIONS = args.generations
+    config.MUTATION_RATE = args.mutation_rate
+    config.ELITE_SIZE = args.elite
+    config.ARRAY_POPULATION = args.array
+    config.SOLVER = args.solver
+    config.HYBRID_MODE = args.hybrid_mode
+    if args.restarts:
+        config.RESTARTS = True
+        config.RESTART_SCHEDULE = args.restarts
+    config.SEED = args.seed
+    config.SOLUTION_CACHE_PATH = args.cache
+    config.VERBOSE = False
+    config.REALTIME_VISUALIZATION = False
+    
+    source = sys.stdin if args.input == '-' else open(args.input)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        run_batch(read_puzzles(source), output, config, args.workers, args.order, args.window)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Benchmark reproducible del solucionador.
+
+Mide evaluaciones de fitness por segundo, generaciones por segundo, percentiles
+del tiempo de resolución y tasa de éxito sobre N semillas, y compara dos
+informes para detectar regresiones:
+
+    python benchmark.py run --seeds 5 -o base.json
+    python benchmark.py run --seeds 5 -o nuevo.json
+    python benchmark.py compare base.json nuevo.json
+
+El subcomando scaling mide el coste por generación frente al tamaño del tablero
+(9x9, 16x16, 25x25) sobre puzzles generados:
+
+    python benchmark.py scaling --box-size 3 --box-size 4 --box-size 5
+
+El subcomando kernels comprueba que los backends de núcleos (NumPy y numba)
+dan los mismos resultados y compara sus tiempos:
+
+    python benchmark.py kernels
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+from config import Config
+from genetic_algorithm import GeneticAlgorithm
+from kernels import check_backends, resolve_backend
+from puzzles import corpus, generate_puzzle
+from solve import solver_class
+from sudoku import Sudoku
+
+# Métricas comparables y si un valor mayor es mejor
+METRICS = {
+    'fitness_evals_per_sec': True,
+    'batch_fitness_evals_per_sec': True,
+    'generations_per_sec': True,
+    'success_rate': True,
+    'time_to_solve_p50': False,
+    'time_to_solve_p90': False,
+    'time_to_solve_p99': False,
+}
+
+def config_to_dict(config):
+    return {name: getattr(config, name) for name in dir(config) if name.isupper()}
+
+def measure_fitness_throughput(board, config, seed, n_boards=1000):
+    """Evaluaciones de fitness por segundo, una a una y en lote"""
+    sudoku = Sudoku(board)
+    boards = GeneticAlgorithm(sudoku, config, rng=np.random.default_rng(seed)).random_boards(n_boards)
+    
+    start = time.perf_counter()
+    for candidate in boards:
+        sudoku.fitness(candidate)
+    single = n_boards / (time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    sudoku.fitness_batch(boards)
+    batch = n_boards / (time.perf_counter() - start)
+    return single, batch
+
+def measure_generation_rate(board, config, seed, generations=20):
+    """Generaciones por segundo del bucle evolve (sin contar la inicialización ni la primera generación)"""
+    ga = GeneticAlgorithm(Sudoku(board), config, rng=np.random.default_rng(seed))
+    ga.initialize_population()
+    try:
+        # Generación sin cronometrar: con PARALLEL_WORKERS la primera crea el pool de procesos
+        ga.evolve()
+        start = time.perf_counter()
+        for _ in range(generations):
+            ga.evolve()
+        return generations / (time.perf_counter() - start)
+    finally:
+        ga.close_parallel()
+
+def measure_time_to_solve(board, config, seeds):
+    """Ejecuta solve con cada semilla; devuelve [(resuelto, segundos, generaciones)]"""
+    runs = []
+    for seed in seeds:
+        sudoku = Sudoku(board)
+        solver = solver_class(config)
+        ga = solver(sudoku, config, rng=np.random.default_rng(seed))
+        start = time.perf_counter()
+        solution = ga.solve()
+        runs.append((sudoku.is_solved(solution), time.perf_counter() - start, ga.generation))
+    return runs
+
+def benchmark_puzzle(board, config, seeds, generations=20):
+    single, batch = measure_fitness_throughput(board, config, seeds[0])
+    runs = measure_time_to_solve(board, config, seeds)
+    solved_times = [elapsed for solved, elapsed, _ in runs if solved]
+    percentiles = [float(p) for p in np.percentile(solved_times, [50, 90, 99])] if solved_times else [None] * 3
+    
+    return {
+        'fitness_evals_per_sec': single,
+        'batch_fitness_evals_per_sec': batch,
+        'generations_per_sec': measure_generation_rate(board, config, seeds[0], generations),
+        'success_rate': len(solved_times) / len(runs),
+        'time_to_solve_p50': percentiles[0],
+        'time_to_solve_p90': percentiles[1],
+        'time_to_solve_p99': percentiles[2],
+        'mean_generations': float(np.mean([gens for _, _, gens in runs])),
+        'runs': [{'seed': seed, 'solved': bool(solved), 'time': elapsed, 'generations': gens}
+                 for seed, (solved, elapsed, gens) in zip(seeds, runs)]
+    }
+
+def run_benchmark(config, seeds, difficulties=None, verbose=False):
+    """Ejecuta el benchmark sobre el corpus y devuelve el informe como diccionario"""
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seeds': list(seeds),
+            'kernel_backend': resolve_backend(config.KERNEL_BACKEND),
+            'config': config_to_dict(config)
+        },
+        'puzzles': {}
+    }
+    
+    warm_up(config)
+    for name, difficulty, board in corpus(difficulties):
+        if verbose:
+            print(f"Benchmark {name} ({difficulty})...", file=sys.stderr)
+        result = benchmark_puzzle(board, config, list(seeds))
+        result['difficulty'] = difficulty
+        report['puzzles'][name] = result
+    
+    return report
+
+def warm_up(config):
+    """Una generación y unas evaluaciones sin cronometrar en un 4x4, para que la
+    compilación de los núcleos numba no cuente en la primera medida"""
+    board = generate_puzzle(2, rng=np.random.default_rng(0))
+    measure_generation_rate(board, config, 0, generations=1)
+    measure_fitness_throughput(board, config, 0, n_boards=10)
+
+def run_scaling(config, box_sizes, seeds, generations=20, verbose=False):
+    """Coste por generación y throughput de fitness para cada tamaño de caja.
+    
+    Cada tamaño usa un puzzle generado con la mitad de celdas vacías por semilla
+    y se promedia sobre las semillas. La propagación de restricciones se
+    desactiva: resolvería casi todas las celdas libres y se mediría ella y no
+    el AG.
+    """
+    scaling_config = Config()
+    scaling_config.__dict__.update(config.__dict__)
+    scaling_config.CONSTRAINT_PROPAGATION = False
+    config = scaling_config
+    warm_up(config)
+    report = {}
+    for box_size in box_sizes:
+        size = box_size * box_size
+        if verbose:
+            print(f"Escalado {size}x{size}...", file=sys.stderr)
+        rates, throughputs = [], []
+        for seed in seeds:
+            board = generate_puzzle(box_size, rng=np.random.default_rng(seed))
+            rates.append(measure_generation_rate(board, config, seed, generations))
+            throughputs.append(measure_fitness_throughput(board, config, seed)[1])
+        generations_per_sec = float(np.mean(rates))
+        report[f'{size}x{size}'] = {
+            'box_size': box_size,
+            'cells': size * size,
+            'generations_per_sec': generations_per_sec,
+            'ms_per_generation': 1000 / generations_per_sec,
+            'us_per_generation_per_cell': 1e6 / generations_per_sec / (size * size),
+            'batch_fitness_evals_per_sec': float(np.mean(throughputs))
+        }
+    return report
+
+def compare_reports(old, new, threshold=0.1):
+    """Compara dos informes métrica a métrica.
+    
+    Devuelve una lista de (puzzle, métrica, antes, después, cambio relativo,
+    es_regresión); hay regresión si la métrica empeora más que threshold.
+    """
+    rows = []
+    for name, new_result in new['puzzles'].items():
+        old_result = old['puzzles'].get(name)
+        if old_result is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before, after = old_result.get(metric), new_result.get(metric)
+            if before is None or after is None:
+                # Dejar de resolver un puzzle que antes se resolvía es una regresión
+                regression = before is not None and after is None
+                rows.append((name, metric, before, after, None, regression))
+                continue
+            change = (after - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            rows.append((name, metric, before, after, change, worse > threshold))
+    return rows
+
+def print_comparison(rows):
+    def fmt(value):
+        return "n/a" if value is None else f"{value:.4g}"
+    
+    for name, metric, before, after, change, regression in rows:
+        change_text = f"{change:+.1%}" if change is not None else "n/a"
+        flag = "  << REGRESIÓN" if regression else ""
+        print(f"{name:<18} {metric:<28} {fmt(before):>10} -> {fmt(after):<10} {change_text:>8}{flag}")
+
+def print_kernel_check(results):
+    print(f"{'Núcleo':<18} {'Iguales':>8} {'NumPy (s)':>10} {'Otro (s)':>10} {'Aceleración':>12}")
+    for kernel, (same, numpy_time, other_time) in results.items():
+        speedup = numpy_time / other_time if other_time else float('inf')
+        print(f"{kernel:<18} {'sí' if same else 'NO':>8} {numpy_time:>10.4f} {other_time:>10.4f} {speedup:>11.1f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del algoritmo genético")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = subparsers.add_parser('run', help="Ejecutar el benchmark")
+    run_parser.add_argument('-o', '--output', default='-', help="Fichero JSON del informe ('-' para stdout)")
+    run_parser.add_argument('--seeds', type=int, default=5, help="Número de semillas por puzzle")
+    run_parser.add_argument('--difficulty', action='append', help="Limitar a una dificultad (repetible)")
+    run_parser.add_argument('--population', type=int, default=Config.POPULATION_SIZE)
+    run_parser.add_argument('--generations', type=int, default=Config.GENERATIONS)
+    run_parser.add_argument('--array', action='store_true', help="Usar la población en modo array")
+    run_parser.add_argument('--solver', choices=['ga', 'exact', 'hybrid'], default=Config.SOLVER)
+    run_parser.add_argument('--hybrid-mode', choices=['race', 'fallback'], default=Config.HYBRID_MODE)
+    run_parser.add_argument('--restarts', choices=['luby', 'geometric'], default=None,
+                            help="Medir el tiempo de resolución con reinicios programados")
+    run_parser.add_argument('--restart-base', type=int, default=Config.RESTART_BASE)
+    run_parser.add_argument('--workers', type=int, default=Config.PARALLEL_WORKERS,
+                            help="Procesos que generan los hijos en modo array (0 = en serie)")
+    run_parser.add_argument('--backend', choices=['auto', 'numba', 'numpy'], default=Config.KERNEL_BACKEND,
+                            help="Backend de los núcleos de fitness y operadores")
+    run_parser.add_argument('--no-propagation', action='store_true',
+                            help="Desactivar la propagación de restricciones para medir sólo el AG")
+    
+    scaling_parser = subparsers.add_parser('scaling', help="Coste por generación según el tamaño del tablero")
+    scaling_parser.add_argument('-o', '--output', default='-', help="Fichero JSON del informe ('-' para stdout)")
+    scaling_parser.add_argument('--box-size', type=int, action='append',
+                                help="Lado de caja a medir (repetible; por defecto 3, 4 y 5)")
+    scaling_parser.add_argument('--seeds', type=int, default=3, help="Número de semillas por tamaño")
+    scaling_parser.add_argument('--generations', type=int, default=20, help="Generaciones medidas por semilla")
+    scaling_parser.add_argument('--population', type=int, default=Config.POPULATION_SIZE)
+    scaling_parser.add_argument('--array', action='store_true', help="Usar la población en modo array")
+    scaling_parser.add_argument('--workers', type=int, default=Config.PARALLEL_WORKERS,
+                                help="Procesos que generan los hijos en modo array (0 = en serie)")
+    scaling_parser.add_argument('--backend', choices=['auto', 'numba', 'numpy'], default=Config.KERNEL_BACKEND,
+                                help="Backend de los núcleos de fitness y operadores")
+    
+    kernels_parser = subparsers.add_parser('kernels', help="Comprobar y cronometrar los backends de núcleos")
+    kernels_parser.add_argument('--boards', type=int, default=200, help="Tableros aleatorios por tamaño")
+    kernels_parser.add_argument('--seed', type=int, default=0)
+    
+    compare_parser = subparsers.add_parser('compare', help="Comparar dos informes")
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help="Empeoramiento relativo que se considera regresión")
+    args = parser.parse_args(argv)
+    
+    if args.command == 'compare':
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        rows = compare_reports(old, new, args.threshold)
+        print_comparison(rows)
+        return 1 if any(row[-1] for row in rows) else 0
+    
+    if args.command == 'kernels':
+        # Una pasada pequeña antes para que la compilación de numba no cuente en los tiempos
+        check_backends(n_boards=1)
+        results = check_backends(n_boards=args.boards, seed=args.seed)
+        print_kernel_check(results)
+        return 0 if all(same for same, _, _ in results.values()) else 1
+    
+    config = Config()
+    config.POPULATION_SIZE = args.population
+    config.ARRAY_POPULATION = args.array
+    config.KERNEL_BACKEND = args.backend
+    config.PARALLEL_WORKERS = args.workers
+    config.VERBOSE = False
+    config.REALTIME_VISUALIZATION = False
+    if args.command == 'scaling':
+        report = run_scaling(config, args.box_size or [3, 4, 5], range(args.seeds),
+                             args.generations, verbose=True)
+    else:
+        config.GENERATIONS = args.generations
+        config.SOLVER = args.solver
+        config.HYBRID_MODE = args.hybrid_mode
+        # Queda en meta.config del informe como CONSTRAINT_PROPAGATION
+        config.CONSTRAINT_PROPAGATION = not args.no_propagation
+        if args.restarts:
+            config.RESTARTS = True
+            config.RESTART_SCHEDULE = args.restarts
+            config.RESTART_BASE = args.restart_base
+        report = run_benchmark(config, range(args.seeds), args.difficulty, verbose=True)
+    
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
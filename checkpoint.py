@@ -0,0 +1,90 @@
+"""Checkpoints de ejecuciones largas del algoritmo genético en formato .npz"""
+import json
+import os
+import numpy as np
+from genetic_algorithm import Individual
+from history import History
+from operators import AdaptivePursuit
+
+# Prefijos de las claves del estado de cada control adaptativo de operadores
+CONTROLS = ('crossover', 'mutation')
+
+def save_checkpoint(ga, path):
+    """Guarda el estado completo de ga en path de forma atómica.
+    
+    Incluye la población como uint8, los fitness, los contadores, el historial,
+    la última medida de diversidad, el estado de los controles adaptativos de
+    operadores, el estado del generador aleatorio y el
+    tablero tras la propagación.
+    """
+    if ga.config.ARRAY_POPULATION:
+        boards = ga.boards
+    else:
+        boards = np.array([individual.board for individual in ga.population])
+    
+    state = {
+        'boards': boards.astype(np.uint8),
+        'fitness': np.asarray(ga.fitness_values),
+        'counters': np.array([ga.generation, ga.stagnation_counter, ga.best_fitness_ever]),
+        'initial_board': ga.sudoku.initial_board.astype(np.uint8),
+        # El estado del bit generator contiene enteros de 128 bits: se guarda como JSON
+        'rng_state': np.array(json.dumps(ga.rng.bit_generator.state)),
+    }
+    for field, _ in History.FIELDS:
+        state[f'history_{field}'] = ga.history[field]
+    # Con DIVERSITY_CONTROL la última medida decide la mutación y la inyección de la siguiente generación
+    if ga.diversity is not None:
+        state['diversity'] = np.array([ga.diversity, ga.distance_to_best, ga.diversity_generation])
+        state['distances'] = ga.distances
+    # Las probabilidades de los controles adaptativos eligen los operadores de la siguiente generación
+    for prefix in CONTROLS:
+        control = getattr(ga, f'{prefix}_control')
+        if control is not None:
+            state[f'{prefix}_operators'] = np.array(control.names)
+            state.update({f'{prefix}_{field}': value for field, value in control.state().items()})
+    
+    # Escribir en un temporal y renombrar para no dejar un checkpoint a medias
+    tmp_path = f"{path}.tmp.npz"
+    np.savez_compressed(tmp_path, **state)
+    os.replace(tmp_path, path)
+
+def load_checkpoint(ga, path):
+    """Restaura en ga el estado guardado con save_checkpoint"""
+    with np.load(path) as data:
+        sudoku = ga.sudoku
+        # Las celdas promovidas a fijas por la propagación forman parte del estado
+        sudoku.initial_board = data['initial_board'].astype(sudoku.initial_board.dtype)
+        sudoku.fixed_positions = sudoku.initial_board != 0
+        sudoku.candidates = sudoku.compute_candidates(sudoku.initial_board)
+        sudoku._row_fills = {}
+        
+        boards = data['boards'].astype(sudoku.initial_board.dtype)
+        fitness = data['fitness']
+        if ga.config.ARRAY_POPULATION:
+            ga.boards = boards
+            ga.fitness_values = fitness.copy()
+            ga.update_best_array()
+        else:
+            ga.set_population([Individual(board, int(value))
+                               for board, value in zip(boards, fitness)])
+        
+        ga.generation, ga.stagnation_counter, ga.best_fitness_ever = (int(v) for v in data['counters'])
+        ga.history.load({field: data[f'history_{field}'] for field, _ in History.FIELDS
+                         if f'history_{field}' in data.files})
+        # El tiempo de ejecución continúa desde el último registrado
+        last = ga.history.last()
+        if last:
+            ga.elapsed = last['elapsed']
+        if 'diversity' in data.files:
+            ga.diversity, ga.distance_to_best, generation = (float(v) for v in data['diversity'])
+            ga.diversity_generation = int(generation)
+            ga.distances = data['distances'].copy()
+        for prefix in CONTROLS:
+            control = getattr(ga, f'{prefix}_control')
+            if control is not None and f'{prefix}_operators' in data.files:
+                names = [str(name) for name in data[f'{prefix}_operators']]
+                if names != control.names:
+                    raise ValueError(f"El checkpoint usa los operadores de {prefix} {names}, "
+                                     f"no {control.names}")
+                control.load_state({field: data[f'{prefix}_{field}'] for field in AdaptivePursuit.STATE})
+        ga.rng.bit_generator.state = json.loads(str(data['rng_state']))
@@ -5,8 +5,78 @@ class Config:
     MUTATION_RATE = 0.4
     ELITE_SIZE = 15
     TOURNAMENT_SIZE = 5
+    SEED = None  # Semilla del generador de numpy (None = no reproducible)
+    CONSTRAINT_PROPAGATION = True  # Singles desnudos/ocultos y operadores restringidos a candidatos legales
+    INCREMENTAL_FITNESS = True  # Evaluación delta en el modo Individual; sin propagación, en 9x9 y 16x16 es igual o más rápido recalcular
+    FITNESS_CACHE_SIZE = 0  # Tableros en la caché LRU de Sudoku.fitness (0 = desactivada)
+    ARRAY_POPULATION = False  # Población en un único array (N, n, n) con fitness vectorizado
+    KERNEL_BACKEND = 'auto'  # Núcleos de fitness y operadores: 'auto' (numba si está instalado), 'numba' o 'numpy'
+    PARALLEL_WORKERS = 0  # Modo array: procesos que generan los hijos sobre memoria compartida (0 = en serie)
+    PARALLEL_CHUNK = 250  # Hijos por tarea del pool; con la misma semilla, mismo resultado con cualquier número de procesos
+    
+    # Operadores del registro (operators.py) con selección por persecución adaptativa
+    ADAPTIVE_OPERATORS = False  # Si es False se usan el cruce por filas y las tres mutaciones 70/20/10
+    CROSSOVER_OPERATORS = ('rows', 'bands', 'column_aware')
+    MUTATION_OPERATORS = ('swap', 'row_exchange', 'shuffle', 'conflict_swap', 'inversion')
+    OPERATOR_MIN_PROBABILITY = 0.05  # Probabilidad mínima de cada operador
+    OPERATOR_ALPHA = 0.3  # Tasa de actualización de la calidad estimada de cada operador
+    OPERATOR_BETA = 0.1  # Tasa con que las probabilidades persiguen al mejor operador
+    
+    # Control de diversidad: entropía por celda medida cada generación
+    DIVERSITY_CONTROL = False  # La diversidad regula mutación, tamaño de inyección y reemplazo
+    DIVERSITY_TARGET = 0.3  # Entropía normalizada (0-1) por debajo de la cual la población se da por convergida
+    CROWDING_WINDOW = 20  # Individuos que compara cada hijo en el reemplazo por torneo restringido
+    
+    # Modo memético: búsqueda local tabú sobre los mejores descendientes
+    MEMETIC = False
+    LOCAL_SEARCH_EVERY = 1  # Cada cuántas generaciones se aplica
+    LOCAL_SEARCH_OFFSPRING = 1  # Cuántos de los mejores descendientes se mejoran
+    LOCAL_SEARCH_BUDGET = 200  # Movimientos máximos por individuo
+    TABU_TENURE = 10  # Pasos que un swap permanece prohibido
+    
+    # Modelo de islas (IslandModel)
+    ISLANDS = 4  # Subpoblaciones, cada una en su propio proceso
+    MIGRATION_INTERVAL = 50  # Generaciones entre migraciones
+    MIGRATION_SIZE = 5  # Mejores individuos que emigra cada isla
+    MIGRATION_TOPOLOGY = 'ring'  # 'ring' o 'full' (todas con todas)
+    
+    # Reinicios (RestartScheduler): GENERATIONS pasa a ser el presupuesto total
+    RESTARTS = False  # Usar el planificador de reinicios en batch.py, service.py y benchmark.py
+    RESTART_SCHEDULE = 'luby'  # 'luby' (base * 1, 1, 2, 1, 1, 2, 4, ...) o 'geometric' (base * factor^i)
+    RESTART_BASE = 100  # Generaciones de la unidad del programa
+    RESTART_FACTOR = 1.5  # Razón del programa geométrico
+    RESTART_VARY_PARAMS = False  # Variar población y tasa de mutación entre intentos
+    RESTART_CARRY_ELITES = 0  # Mejores tableros que pasan al siguiente intento (0 = independientes)
+    
+    # Resolvedor exacto e híbrido (exact_solver.py)
+    SOLVER = 'ga'  # 'ga', 'exact' (backtracking) o 'hybrid' en batch.py, service.py y benchmark.py
+    HYBRID_MODE = 'race'  # 'race' (ambos motores a la vez) o 'fallback' (exacto tras estancarse el AG)
+    HYBRID_STAGNATION = 200  # Generaciones sin mejora antes de pasar al exacto en modo 'fallback'
+    EXACT_NODE_LIMIT = 0  # Nodos máximos del backtracking (0 = sin límite)
+    
+    # Servicio local (service.py)
+    SERVICE_QUEUE_SIZE = 16  # Trabajos en espera; con la cola llena se rechazan las peticiones
+    SERVICE_PROGRESS_EVERY = 10  # Generaciones entre eventos de progreso y comprobaciones de cancelación
+    SERVICE_TIMEOUT = None  # Segundos máximos de ejecución por trabajo (None = sin límite)
+    
+    # Checkpoints
+    CHECKPOINT_EVERY = 0  # Guardar el estado cada N generaciones (0 = nunca)
+    CHECKPOINT_PATH = 'checkpoint.npz'
+    
+    # Caché de soluciones (batch.py y service.py)
+    SOLUTION_CACHE_PATH = None  # Fichero SQLite indexado por forma canónica (None = sin caché)
+    
+    # Historial de la evolución
+    HISTORY_STRIDE = 1  # Registrar una de cada N generaciones
+    HISTORY_CHUNK = 4096  # Filas que se añaden a las columnas cada vez que se llenan
+    HISTORY_DIVERSITY = False  # Medir diversidad y distancia para el historial sin DIVERSITY_CONTROL (NaN si no)
     
     # Parámetros de visualización
     SHOW_EVERY = 50  # Actualizar visualización cada N generaciones
     VERBOSE = True
+    PROFILE = False  # Medir tiempos por fase (selección, cruce, mutación, evaluación...)
+    PROFILE_GENERATIONS = 1000  # Generaciones recientes con desglose por fase (una de cada HISTORY_STRIDE)
     REALTIME_VISUALIZATION = True  # Activar visualización en tiempo real
+    VISUALIZATION_BLIT = True  # Blitting en RealtimeVisualizer: sólo se redibujan los artistas que cambian
+    VISUALIZATION_MAX_POINTS = 2000  # Puntos máximos del histórico dibujado (se diezma al llenarse)
+    GUI_FPS = 20  # Refrescos por segundo del tablero en la GUI
@@ -0,0 +1,37 @@
+"""Medidas vectorizadas de diversidad de una población de tableros (N, n, n)"""
+import numpy as np
+
+def hamming_to_best(boards, best, free_mask):
+    """Fracción de celdas libres en que cada tablero difiere del mejor: array (N,)"""
+    free = free_mask.reshape(-1)
+    differ = boards.reshape(len(boards), -1)[:, free] != best.reshape(-1)[free]
+    return differ.mean(axis=1) if free.any() else np.zeros(len(boards))
+
+def cell_entropy(boards, size):
+    """Entropía del valor de cada celda en la población, normalizada a [0, 1]: array (n, n).
+    
+    0 si todos los tableros coinciden en la celda; 1 si los n dígitos son equiprobables.
+    """
+    n_boards = len(boards)
+    cells = size * size
+    flat = boards.reshape(n_boards, cells)
+    counts = np.bincount((np.arange(cells) * (size + 1) + flat).ravel(), minlength=cells * (size + 1))
+    p = counts.reshape(cells, size + 1) / n_boards
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropy = -np.where(p > 0, p * np.log(p), 0.0).sum(axis=1)
+    return (entropy / np.log(size)).reshape(size, size)
+
+def population_diversity(boards, free_mask):
+    """Entropía media por celda libre: 0 = población convergida, 1 = máximamente diversa"""
+    if not free_mask.any():
+        return 0.0
+    return float(cell_entropy(boards, len(free_mask))[free_mask].mean())
+
+def nearest_in_windows(boards, candidates, windows):
+    """Para cada candidato, el índice de boards más parecido dentro de su ventana.
+    
+    candidates (M, n, n) y windows (M, W) índices de boards; devuelve (M,).
+    """
+    flat = boards.reshape(len(boards), -1)
+    distances = (flat[windows] != candidates.reshape(len(candidates), 1, -1)).sum(axis=2)
+    return windows[np.arange(len(windows)), np.argmin(distances, axis=1)]
@@ -0,0 +1,314 @@
+"""Resolución exacta por backtracking con máscaras de bits y modo híbrido con el AG"""
+import multiprocessing
+import threading
+import time
+import numpy as np
+from config import Config
+from genetic_algorithm import GeneticAlgorithm, Individual
+from restarts import RestartScheduler
+
+# Nodos del backtracking entre llamadas al callback (cancelación)
+CHECK_EVERY = 1000
+
+class ExactSolver:
+    """Backtracking que rellena siempre la celda con menos candidatos (MRV) o,
+    si no hay ninguna forzada, un single oculto.
+    
+    Mismo interfaz que GeneticAlgorithm: solve() devuelve el tablero y deja
+    best_individual, generation (siempre 0) y elapsed. Si el callback devuelve
+    False, se agota EXACT_NODE_LIMIT o el puzzle no tiene solución, devuelve
+    el tablero inicial con las celdas vacías a 0 (solved queda a False).
+    """
+    
+    def __init__(self, sudoku, config=Config(), callback=None, rng=None):
+        self.sudoku = sudoku
+        self.config = config
+        self.callback = callback
+        self.best_individual = Individual.evaluate(np.copy(sudoku.initial_board), sudoku)
+        self.generation = 0
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.solved = False
+        self.stopped = False
+        self.unit_cells = None
+    
+    def search(self, board, used, empty, cell_units, all_digits):
+        """Backtracking recursivo sobre listas de Python; True si completa el tablero"""
+        if not empty:
+            return True
+        # MRV: la celda vacía con menos candidatos (se corta al encontrar 0 o 1)
+        best_index, best_mask, best_count = -1, 0, all_digits.bit_count() + 1
+        for index, cell in enumerate(empty):
+            row, col, box = cell_units[cell]
+            mask = all_digits & ~(used[row] | used[col] | used[box])
+            count = mask.bit_count()
+            if count < best_count:
+                best_index, best_mask, best_count = index, mask, count
+                if count <= 1:
+                    break
+        if best_count == 0:
+            return False
+        if best_count > 1:
+            # Singles ocultos: un dígito que sólo cabe en una celda de su unidad
+            hidden = self.hidden_single(board, used, cell_units, all_digits)
+            if hidden is False:
+                return False
+            if hidden is not None:
+                cell, best_mask = hidden
+                best_index = empty.index(cell)
+        
+        cell = empty[best_index]
+        empty[best_index] = empty[-1]
+        empty.pop()
+        row, col, box = cell_units[cell]
+        mask = best_mask
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            self.nodes += 1
+            if self.nodes % CHECK_EVERY == 0 and not self.keep_going():
+                break
+            used[row] |= bit
+            used[col] |= bit
+            used[box] |= bit
+            board[cell] = bit.bit_length() - 1
+            if self.search(board, used, empty, cell_units, all_digits):
+                return True
+            used[row] ^= bit
+            used[col] ^= bit
+            used[box] ^= bit
+            if self.stopped:
+                break
+        board[cell] = 0
+        empty.append(cell)
+        empty[best_index], empty[-1] = empty[-1], empty[best_index]
+        return False
+    
+    def hidden_single(self, board, used, cell_units, all_digits):
+        """(celda, bit) de un dígito con un único hueco en su unidad, None si no hay y
+        False si a algún dígito no le queda sitio en su unidad"""
+        for unit, cells in enumerate(self.unit_cells):
+            missing = all_digits & ~used[unit]
+            if not missing:
+                continue
+            once = twice = 0
+            for cell in cells:
+                if not board[cell]:
+                    row, col, box = cell_units[cell]
+                    mask = all_digits & ~(used[row] | used[col] | used[box])
+                    twice |= once & mask
+                    once |= mask
+            if missing & ~once:
+                return False
+            single = once & ~twice
+            if single:
+                bit = single & -single
+                for cell in cells:
+                    if not board[cell]:
+                        row, col, box = cell_units[cell]
+                        if bit & ~(used[row] | used[col] | used[box]):
+                            return cell, bit
+        return None
+    
+    def keep_going(self):
+        """Consulta el callback y el límite de nodos; marca stopped si hay que parar"""
+        limit = self.config.EXACT_NODE_LIMIT
+        if (limit and self.nodes >= limit) or (self.callback and not self.callback(self)):
+            self.stopped = True
+        return not self.stopped
+    
+    def solve(self):
+        start = time.perf_counter()
+        sudoku = self.sudoku
+        board = sudoku.initial_board.reshape(-1).tolist()
+        cell_units = sudoku.units_of_cell.tolist()
+        self.unit_cells = sudoku.units.tolist()
+        used = [0] * sudoku.n_units
+        # Unas pistas que ya chocan entre sí no tienen solución
+        consistent = True
+        for cell, value in enumerate(board):
+            if value:
+                for unit in cell_units[cell]:
+                    consistent = consistent and not (used[unit] >> value) & 1
+                    used[unit] |= 1 << value
+        empty = [cell for cell, value in enumerate(board) if not value]
+        
+        try:
+            if consistent:
+                self.solved = self.search(board, used, empty, cell_units, sudoku.all_digits)
+        finally:
+            self.elapsed += time.perf_counter() - start
+        
+        solution = np.array(board, dtype=sudoku.initial_board.dtype).reshape(sudoku.initial_board.shape)
+        # Sin pasar por sudoku.fitness: en modo carrera la caché de fitness es del hilo del AG
+        self.best_individual = Individual(solution, sudoku.max_fitness - sudoku.count_conflicts(solution))
+        if self.config.VERBOSE:
+            status = "resuelto" if self.solved else "sin solución"
+            print(f"Backtracking {status} en {self.nodes} nodos ({self.elapsed * 1000:.1f} ms)")
+        return solution
+
+def run_exact_process(sudoku, config, stop_event, connection):
+    """Motor exacto del modo 'race' en su propio proceso; envía (resuelto, tablero, nodos, segundos)"""
+    exact = ExactSolver(sudoku, config, callback=lambda exact: not stop_event.is_set())
+    solution = exact.solve()
+    connection.send((exact.solved, solution, exact.nodes, exact.elapsed))
+    connection.close()
+
+class HybridSolver:
+    """Backtracking exacto y algoritmo genético combinados; winner indica quién resolvió.
+    
+    - 'race': los dos motores corren a la vez, el exacto en otro proceso, y el
+      primero que resuelve detiene al otro. Con un solo núcleo, o dentro de un
+      proceso de un pool (batch.py), que no puede crear procesos, el exacto
+      corre en un hilo y se reparte el GIL con el AG: sólo acota la latencia
+      intercalando ambos.
+    - 'fallback': corre el AG y, si lleva HYBRID_STAGNATION generaciones sin
+      mejorar o agota las generaciones, se detiene y resuelve el exacto.
+    
+    El motor genético es RestartScheduler si Config.RESTARTS, si no GeneticAlgorithm.
+    """
+    
+    def __init__(self, sudoku, config=Config(), callback=None, rng=None):
+        self.sudoku = sudoku
+        self.config = config
+        self.callback = callback
+        self.rng = rng
+        self.ga = None
+        self.exact = None
+        self.best_individual = None
+        self.generation = 0
+        self.elapsed = 0.0
+        self.winner = None
+        self.cancelled = False
+        self.finished = threading.Event()
+        self.lock = threading.Lock()
+    
+    def declare_winner(self, engine):
+        with self.lock:
+            if self.winner is None:
+                self.winner = engine
+        self.finished.set()
+    
+    def ga_callback(self, ga):
+        """Reenvía el progreso del AG; lo detiene si otro motor terminó"""
+        if self.finished.is_set():
+            return False
+        return self.forward(ga)
+    
+    def exact_callback(self, exact):
+        if self.finished.is_set():
+            return False
+        return self.forward(exact)
+    
+    def forward(self, engine):
+        """Callback del usuario; si devuelve False se detienen ambos motores"""
+        if self.callback and not self.callback(engine):
+            self.cancelled = True
+            self.finished.set()
+            return False
+        return True
+    
+    def race(self):
+        if multiprocessing.current_process().daemon or multiprocessing.cpu_count() < 2:
+            return self.race_thread()
+        stop_event = multiprocessing.Event()
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=run_exact_process,
+                                          args=(self.sudoku, self.config, stop_event, sender), daemon=True)
+        process.start()
+        sender.close()
+        
+        def receive_exact():
+            try:
+                solved, solution, nodes, elapsed = receiver.recv()
+            except EOFError:  # El proceso terminó sin responder
+                return
+            exact = self.exact
+            exact.solved, exact.nodes, exact.elapsed = solved, nodes, elapsed
+            exact.best_individual = Individual(solution, self.sudoku.max_fitness - self.sudoku.count_conflicts(solution))
+            if solved:
+                self.declare_winner('exact')
+        
+        receiver_thread = threading.Thread(target=receive_exact, daemon=True)
+        receiver_thread.start()
+        try:
+            board = self.ga.solve()
+            if self.sudoku.is_solved(board):
+                self.declare_winner('ga')
+            # Si el AG agotó sus generaciones, el exacto sigue hasta terminar; el
+            # callback del usuario se sigue consultando para poder cancelarlo
+            while receiver_thread.is_alive() and not self.finished.is_set():
+                receiver_thread.join(timeout=0.1)
+                if receiver_thread.is_alive():
+                    self.exact_callback(self.exact)
+        finally:
+            stop_event.set()
+            receiver_thread.join()
+            process.join()
+            receiver.close()
+        self.finished.set()
+    
+    def race_thread(self):
+        """Modo 'race' con el exacto en un hilo del mismo proceso"""
+        def run_exact():
+            self.exact.solve()
+            if self.exact.solved:
+                self.declare_winner('exact')
+        
+        thread = threading.Thread(target=run_exact, daemon=True)
+        thread.start()
+        board = self.ga.solve()
+        if self.sudoku.is_solved(board):
+            self.declare_winner('ga')
+        # Si el AG agotó sus generaciones, el exacto sigue hasta terminar
+        thread.join()
+        self.finished.set()
+    
+    def fallback(self):
+        stagnant_calls = 0
+        best_seen = -1
+        
+        def stagnation_callback(ga):
+            nonlocal stagnant_calls, best_seen
+            if ga.best_individual.fitness > best_seen:
+                best_seen, stagnant_calls = ga.best_individual.fitness, 0
+            else:
+                stagnant_calls += 1
+            if stagnant_calls * self.config.SHOW_EVERY >= self.config.HYBRID_STAGNATION:
+                return False
+            return self.ga_callback(ga)
+        
+        # RestartScheduler reenvía a su callback el AG de cada intento, así que sirve igual
+        self.ga.callback = stagnation_callback
+        board = self.ga.solve()
+        if self.sudoku.is_solved(board):
+            self.declare_winner('ga')
+        elif not self.cancelled:
+            # Estancado o sin generaciones: el exacto termina el trabajo
+            self.exact.solve()
+            if self.exact.solved:
+                self.declare_winner('exact')
+    
+    def solve(self):
+        start = time.perf_counter()
+        engine = RestartScheduler if self.config.RESTARTS else GeneticAlgorithm
+        self.ga = engine(self.sudoku, self.config, callback=self.ga_callback, rng=self.rng)
+        self.exact = ExactSolver(self.sudoku, self.config, callback=self.exact_callback)
+        try:
+            if self.config.HYBRID_MODE == 'race':
+                self.race()
+            elif self.config.HYBRID_MODE == 'fallback':
+                self.fallback()
+            else:
+                raise ValueError(f"Modo híbrido desconocido: {self.config.HYBRID_MODE}")
+        finally:
+            self.elapsed += time.perf_counter() - start
+        
+        self.generation = self.ga.generation
+        if self.winner == 'exact' or self.ga.best_individual is None:
+            self.best_individual = self.exact.best_individual
+        else:
+            self.best_individual = self.ga.best_individual
+        if self.config.VERBOSE:
+            print(f"Motor ganador: {self.winner or 'ninguno'} ({self.elapsed:.3f} s)")
+        return self.best_individual.board
@@ -1,140 +1,600 @@
+import multiprocessing
 import numpy as np
-import random
+import time
 from config import Config
+from diversity import hamming_to_best, nearest_in_windows, population_diversity
+from history import History
+from local_search import TabuSearch
+from operators import CROSSOVERS, MUTATIONS, AdaptivePursuit
+from parallel import ParallelBreeder
+from profiling import PhaseProfiler
+from selection import top_k, bottom_k, tournament
 
 class Individual:
-    def __init__(self, board, sudoku):
+    """Tablero (uint8) con su fitness y, si se han calculado, sus cuentas por unidad.
+    
+    No guarda el Sudoku: las operaciones que lo necesitan lo reciben, de modo
+    que cada individuo ocupa sólo sus tres referencias.
+    """
+    __slots__ = ('board', 'fitness', 'counts')
+    
+    def __init__(self, board, fitness, counts=None):
         self.board = board
-        self.sudoku = sudoku
-        self.fitness = sudoku.fitness(board)
+        self.fitness = fitness
+        # Cuentas de dígitos por unidad (27, 10); se calculan sólo si hacen falta
+        self.counts = counts
+    
+    @classmethod
+    def evaluate(cls, board, sudoku):
+        """Individual con el fitness del tablero completo"""
+        return cls(board, sudoku.fitness(board))
     
     def __lt__(self, other):
         return self.fitness > other.fitness
+    
+    def unit_counts(self, sudoku):
+        if self.counts is None:
+            self.counts = sudoku.unit_counts(self.board)
+        return self.counts
+    
+    def copy(self):
+        """Copia independiente"""
+        return Individual(np.copy(self.board), self.fitness, None if self.counts is None else np.copy(self.counts))
+    
+    def apply_changes(self, sudoku, rows, cols, values):
+        """Escribe values en las celdas (rows, cols) y actualiza el fitness por delta.
+        
+        rows y cols son arrays int64 y values un array del tipo del tablero: se
+        pasan sin convertir, y con tipos fijos el núcleo compilado no se
+        especializa por cada combinación.
+        """
+        self.fitness += int(sudoku.kernels.apply_changes(self.board, self.unit_counts(sudoku), sudoku.units_of_cell,
+                                                         rows, cols, values))
 
 class GeneticAlgorithm:
-    def __init__(self, sudoku, config=Config(), callback=None):
+    def __init__(self, sudoku, config=Config(), callback=None, rng=None):
         self.sudoku = sudoku
         self.config = config
+        # Toda la aleatoriedad del AG sale de este generador
+        self.rng = rng if rng is not None else np.random.default_rng(config.SEED)
         self.population = []
         self.best_individual = None
         self.generation = 0
-        self.history = []
+        self.history = History(config.HISTORY_STRIDE, config.HISTORY_CHUNK)
         self.callback = callback
         self.stagnation_counter = 0
         self.best_fitness_ever = 0
+        # Entropía media por celda libre (0-1) y distancia de Hamming media al mejor; None hasta medirlas
+        self.diversity = None
+        self.distance_to_best = None
+        self.distances = None
+        # Posiciones de la población que ocupan los hijos de la última generación (modo memético)
+        self.offspring = None
+        # Generación de la última medida de diversidad (el historial registra NaN en las demás)
+        self.diversity_generation = None
+        # Modo array: todos los tableros en un (N, n, n) y un vector de fitness paralelo
+        self.boards = None
+        self.fitness_values = None
+        # Pool de procesos que generan los hijos del modo array (PARALLEL_WORKERS); vive durante solve
+        self.breeder = None
+        # Tiempos por fase; None si el perfilado está desactivado
+        self.profiler = PhaseProfiler(config.HISTORY_STRIDE, config.PROFILE_GENERATIONS) if config.PROFILE else None
+        self.local_search = None
+        # Controladores de operadores adaptativos; None con los operadores fijos
+        self.crossover_control = self.mutation_control = None
+        if config.ADAPTIVE_OPERATORS:
+            rates = (config.OPERATOR_MIN_PROBABILITY, config.OPERATOR_ALPHA, config.OPERATOR_BETA)
+            self.crossover_control = AdaptivePursuit(CROSSOVERS, config.CROSSOVER_OPERATORS, self.rng, *rates)
+            self.mutation_control = AdaptivePursuit(MUTATIONS, config.MUTATION_OPERATORS, self.rng, *rates)
+        if config.FITNESS_CACHE_SIZE and sudoku.cache_size != config.FITNESS_CACHE_SIZE:
+            sudoku.set_cache_size(config.FITNESS_CACHE_SIZE)
+        sudoku.set_backend(config.KERNEL_BACKEND)
+        self.elapsed = 0.0
+        self.run_start = None
         
     def initialize_population(self):
         """Inicialización mejorada con diversidad"""
-        self.population = []
+        if self.config.CONSTRAINT_PROPAGATION:
+            self.sudoku.propagate_constraints()
         
-        for _ in range(self.config.POPULATION_SIZE):
-            board = np.copy(self.sudoku.initial_board)
-            
-            for row in range(9):
-                fixed_nums = board[row][board[row] != 0].tolist()
-                missing = [n for n in range(1, 10) if n not in fixed_nums]
-                random.shuffle(missing)
-                
-                idx = 0
-                for col in range(9):
-                    if board[row, col] == 0:
-                        board[row, col] = missing[idx]
-                        idx += 1
-            
-            individual = Individual(board, self.sudoku)
-            self.population.append(individual)
+        if self.config.ARRAY_POPULATION:
+            return self.initialize_population_array()
         
-        self.population.sort()
-        self.best_individual = self.population[0]
+        self.set_population([self.evaluate(board)
+                             for board in self.random_boards(self.config.POPULATION_SIZE)])
         self.best_fitness_ever = self.best_individual.fitness
     
-    def tournament_selection(self):
-        """Selección por torneo"""
-        tournament = random.sample(self.population, self.config.TOURNAMENT_SIZE)
-        return min(tournament)
+    def set_population(self, population):
+        """Sustituye la población (sin ordenar) y actualiza el vector de fitness y el mejor"""
+        self.population = population
+        self.fitness_values = np.fromiter((individual.fitness for individual in population),
+                                          dtype=np.int64, count=len(population))
+        self.best_individual = population[int(np.argmax(self.fitness_values))]
     
-    def crossover(self, parent1, parent2):
-        """Cruce mejorado - intercambio de filas"""
-        child_board = np.copy(parent1.board)
-        rows_to_swap = random.sample(range(9), random.randint(2, 5))
+    def crossover(self, parent1, parent2, rows_mask=None):
+        """Cruce mejorado - intercambio de filas
+        
+        rows_mask (n booleanos) indica las filas que se toman de parent2; si no
+        se da, se sortea.
+        """
+        if rows_mask is None:
+            rows_mask = self.random_row_masks(1)[0]
+        rows_to_swap = np.flatnonzero(rows_mask)
         
-        for row in rows_to_swap:
-            child_board[row] = parent2.board[row]
+        if self.config.INCREMENTAL_FITNESS:
+            # Las cuentas quedan en el padre, que suele cruzarse más de una vez
+            parent1.unit_counts(self.sudoku)
+            child = parent1.copy()
+            rows, cols = np.nonzero(parent1.board[rows_to_swap] != parent2.board[rows_to_swap])
+            rows = rows_to_swap[rows]
+            return self.evaluate_changes(child, rows, cols, parent2.board[rows, cols])
         
-        return Individual(child_board, self.sudoku)
+        child = parent1.copy()
+        child.board[rows_to_swap] = parent2.board[rows_to_swap]
+        return self.reevaluate(child)
     
-    def mutate(self, individual):
-        """Mutación mejorada - múltiples estrategias"""
-        if random.random() > self.config.MUTATION_RATE:
+    def mutate(self, individual, draws=None, in_place=False):
+        """Mutación mejorada - múltiples estrategias
+        
+        draws son n + 6 uniformes [0, 1) sorteados de antemano: si se muta, la
+        estrategia (dos valores), la fila, el par o relleno elegido, la segunda
+        fila y n más para las columnas del intercambio entre filas o el orden
+        de la permutación. Con in_place se modifica el propio individual (un
+        hijo recién creado) en lugar de una copia.
+        """
+        if draws is None:
+            draws = self.rng.random(self.sudoku.size + 6)
+        u_apply, u_strategy1, u_strategy2, u_row, u_pick, u_offset = draws[:6]
+        column_draws = draws[6:]
+        if u_apply > self.config.MUTATION_RATE:
             return individual
         
-        board = np.copy(individual.board)
+        board = individual.board
+        rows = cols = values = ()
+        n = self.sudoku.size
+        row = int(u_row * n)
+        kernels = self.sudoku.kernels
+        free = ~self.sudoku.fixed_positions
+        constrained = self.config.CONSTRAINT_PROPAGATION
         
         # Estrategia 1: Swap en fila aleatoria (70%)
-        if random.random() < 0.7:
-            row = random.randint(0, 8)
-            non_fixed = [col for col in range(9) if not self.sudoku.fixed_positions[row, col]]
+        if u_strategy1 < 0.7:
+            pairs = kernels.swap_pairs(board[row], free[row], self.sudoku.candidates[row], constrained)
             
-            if len(non_fixed) >= 2:
-                col1, col2 = random.sample(non_fixed, 2)
-                board[row, col1], board[row, col2] = board[row, col2], board[row, col1]
+            if len(pairs) > 0:
+                cols = pairs[int(u_pick * len(pairs))]
+                rows = np.full(2, row)
+                values = board[row, cols[::-1]]
         
         # Estrategia 2: Swap entre dos filas (20%)
-        elif random.random() < 0.9:
-            row1, row2 = random.sample(range(9), 2)
+        elif u_strategy2 < 0.9:
+            row1, row2 = row, (row + 1 + int(u_offset * (n - 1))) % n
             # Solo swap en columnas no fijas de ambas filas
-            for col in range(9):
-                if not self.sudoku.fixed_positions[row1, col] and not self.sudoku.fixed_positions[row2, col]:
-                    if random.random() < 0.3:
-                        board[row1, col], board[row2, col] = board[row2, col], board[row1, col]
+            swap_cols = kernels.exchange_columns(board, row1, row2, free, self.sudoku.candidates,
+                                                 column_draws, 0.3, constrained)
+            rows = np.repeat([row1, row2], len(swap_cols))
+            cols = np.tile(swap_cols, 2)
+            values = np.concatenate([board[row2, swap_cols], board[row1, swap_cols]])
         
         # Estrategia 3: Reordenar fila completa (10%)
         else:
-            row = random.randint(0, 8)
-            non_fixed_cols = [col for col in range(9) if not self.sudoku.fixed_positions[row, col]]
+            non_fixed_cols = np.flatnonzero(free[row])
+            fills = self.sudoku.row_fills(row) if constrained else None
             if len(non_fixed_cols) > 1:
-                values = [board[row, col] for col in non_fixed_cols]
-                random.shuffle(values)
-                for i, col in enumerate(non_fixed_cols):
-                    board[row, col] = values[i]
+                if fills is not None:
+                    row_values = fills[int(u_pick * len(fills))]
+                else:
+                    order = np.argsort(column_draws[:len(non_fixed_cols)])
+                    row_values = board[row, non_fixed_cols[order]]
+                rows = np.full(len(non_fixed_cols), row)
+                cols = non_fixed_cols
+                values = row_values
+        
+        if self.config.INCREMENTAL_FITNESS:
+            if in_place:
+                child = individual
+            else:
+                individual.unit_counts(self.sudoku)
+                child = individual.copy()
+            if len(rows):
+                self.evaluate_changes(child, rows, cols, values)
+            return child
         
-        return Individual(board, self.sudoku)
+        if not len(rows):
+            return individual
+        child = individual if in_place else individual.copy()
+        child.board[rows, cols] = values
+        return self.reevaluate(child)
+    
+    def evaluate(self, board):
+        """Crea un Individual evaluando el tablero completo"""
+        if self.profiler is None:
+            return Individual.evaluate(board, self.sudoku)
+        t0 = self.profiler.start(nested=True)
+        individual = Individual.evaluate(board, self.sudoku)
+        self.profiler.stop('evaluation', t0, nested=True)
+        return individual
+    
+    def reevaluate(self, individual):
+        """Recalcula el fitness completo de individual tras modificar su tablero"""
+        t0 = self.profiler and self.profiler.start(nested=True)
+        individual.fitness = self.sudoku.fitness(individual.board)
+        individual.counts = None
+        if self.profiler: self.profiler.stop('evaluation', t0, nested=True)
+        return individual
+    
+    def evaluate_changes(self, individual, rows, cols, values):
+        """Aplica cambios sobre individual actualizando su fitness por delta"""
+        if self.profiler is None:
+            individual.apply_changes(self.sudoku, rows, cols, values)
+            return individual
+        t0 = self.profiler.start(nested=True)
+        individual.apply_changes(self.sudoku, rows, cols, values)
+        self.profiler.stop('evaluation', t0, nested=True)
+        return individual
     
     def adaptive_mutation(self):
-        """Ajusta la tasa de mutación basado en estancamiento"""
-        if self.stagnation_counter > 50:
-            # Aumentar mutación para escapar de óptimo local
-            return min(0.8, self.config.MUTATION_RATE * 1.5)
-        elif self.stagnation_counter > 100:
+        """Ajusta la tasa de mutación basado en estancamiento (y en la diversidad si se controla)"""
+        if self.stagnation_counter > 100:
             # Mutación muy alta para resetear búsqueda
-            return 0.9
-        return self.config.MUTATION_RATE
+            rate = 0.9
+        elif self.stagnation_counter > 50:
+            # Aumentar mutación para escapar de óptimo local
+            rate = min(0.8, self.config.MUTATION_RATE * 1.5)
+        else:
+            rate = self.config.MUTATION_RATE
+        if self.converged():
+            # Cuanto más por debajo del objetivo está la diversidad, más cerca de 0.9
+            rate = max(rate, self.config.MUTATION_RATE + (0.9 - self.config.MUTATION_RATE) * self.diversity_deficit())
+        return rate
     
-    def evolve(self):
-        """Evolución con mutación adaptativa"""
-        new_population = []
-        elite = self.population[:self.config.ELITE_SIZE]
-        new_population.extend(elite)
+    def converged(self):
+        """Indica si el control de diversidad está activo y la población bajo el objetivo"""
+        return (self.config.DIVERSITY_CONTROL and self.diversity is not None
+                and self.diversity < self.config.DIVERSITY_TARGET)
+    
+    def diversity_deficit(self):
+        """Distancia relativa (0-1) de la diversidad medida al objetivo"""
+        return max(0.0, 1.0 - self.diversity / self.config.DIVERSITY_TARGET)
+    
+    def population_boards(self):
+        """Tableros de la población como un único array (N, n, n)"""
+        if self.config.ARRAY_POPULATION:
+            return self.boards
+        return np.stack([individual.board for individual in self.population])
+    
+    def measure_diversity(self):
+        """Mide entropía por celda y distancia de Hamming al mejor de toda la población"""
+        boards = self.population_boards()
+        free = ~self.sudoku.fixed_positions
+        self.distances = hamming_to_best(boards, self.best_individual.board, free)
+        self.distance_to_best = float(self.distances.mean())
+        self.diversity = population_diversity(boards, free)
+        self.diversity_generation = self.generation
+    
+    def crowding_slots(self, children, children_fitness):
+        """Reemplazo por torneo restringido: cada hijo compite con el individuo más
+        parecido de una ventana aleatoria de CROWDING_WINDOW y lo sustituye si lo mejora.
         
-        # Mutación adaptativa
-        original_mutation = self.config.MUTATION_RATE
-        self.config.MUTATION_RATE = self.adaptive_mutation()
+        Devuelve (posiciones de la población, índices de los hijos que las ocupan);
+        si varios hijos apuntan a la misma posición se queda el de mayor fitness.
+        """
+        size = len(self.fitness_values)
+        windows = self.rng.integers(0, size, (len(children), min(self.config.CROWDING_WINDOW, size)))
+        targets = nearest_in_windows(self.population_boards(), children, windows)
+        winners = np.flatnonzero(children_fitness > self.fitness_values[targets])
+        winners = winners[np.argsort(-children_fitness[winners], kind='stable')]
+        slots, first = np.unique(targets[winners], return_index=True)
+        return slots, winners[first]
+    
+    def random_boards(self, n):
+        """Genera n tableros aleatorios (n, size, size) con cada fila como permutación.
         
-        while len(new_population) < self.config.POPULATION_SIZE:
-            parent1 = self.tournament_selection()
-            parent2 = self.tournament_selection()
-            child = self.crossover(parent1, parent2)
-            child = self.mutate(child)
-            new_population.append(child)
+        Con propagación de restricciones, cada fila se elige entre sus rellenos legales.
+        """
+        boards = np.repeat(self.sudoku.initial_board[np.newaxis], n, axis=0)
         
-        # Restaurar tasa de mutación original
-        self.config.MUTATION_RATE = original_mutation
+        for row in range(self.sudoku.size):
+            empty_cols = np.flatnonzero(~self.sudoku.fixed_positions[row])
+            if len(empty_cols) == 0:
+                continue
+            fills = self.sudoku.row_fills(row) if self.config.CONSTRAINT_PROPAGATION else None
+            if fills is not None:
+                boards[:, row, empty_cols] = fills[self.rng.integers(0, len(fills), n)]
+                continue
+            missing = self.sudoku.kernels.missing_digits(self.sudoku.initial_board[row], self.sudoku.size)
+            # Una permutación independiente de los dígitos faltantes por tablero
+            perms = self.rng.permuted(np.tile(missing, (n, 1)), axis=1)
+            boards[:, row, empty_cols] = perms[:, :len(empty_cols)]
+        
+        return boards
+    
+    def legal_swaps(self, values, rows):
+        """Pares de columnas intercambiables (n, size, size) en la fila rows[i] con valores values[i].
+        
+        Sólo se marcan pares col1 < col2 de celdas no fijas y, con propagación de
+        restricciones, sólo si cada valor es candidato legal en su nueva celda.
+        """
+        free = ~self.sudoku.fixed_positions[rows]
+        size = self.sudoku.size
+        legal = free[:, :, np.newaxis] & free[:, np.newaxis, :] & np.triu(np.ones((size, size), dtype=bool), 1)
+        if self.config.CONSTRAINT_PROPAGATION:
+            # allowed[i, a, b]: el valor de la columna b es candidato en la columna a
+            allowed = (self.sudoku.candidates[rows][:, :, np.newaxis] >> values[:, np.newaxis, :]) & 1 == 1
+            legal &= allowed & allowed.transpose(0, 2, 1)
+        return legal
+    
+    def initialize_population_array(self):
+        """Inicialización del modo array"""
+        self.boards = self.random_boards(self.config.POPULATION_SIZE)
+        self.fitness_values = self.sudoku.fitness_batch(self.boards)
+        self.update_best_array()
+        self.best_fitness_ever = self.best_individual.fitness
+    
+    def update_best_array(self):
+        """Actualiza el mejor individuo del modo array (la población no se ordena)"""
+        best = int(np.argmax(self.fitness_values))
+        self.best_individual = Individual(self.boards[best].copy(), int(self.fitness_values[best]))
+    
+    def tournament_selection_array(self, n):
+        """n torneos simultáneos; devuelve los índices de los ganadores"""
+        return tournament(self.fitness_values, n, self.config.TOURNAMENT_SIZE, self.rng)
+    
+    def random_row_masks(self, n):
+        """n máscaras (n, size) con entre 2 y size/2 + 1 filas elegidas al azar (2 a 5 en 9x9)"""
+        size = self.sudoku.size
+        n_rows = self.rng.integers(2, size // 2 + 2, n)
+        ranks = np.argsort(np.argsort(self.rng.random((n, size)), axis=1), axis=1)
+        return ranks < n_rows[:, np.newaxis]
+    
+    def crossover_array(self, parents1, parents2):
+        """Cruce vectorizado: cada hijo toma de 2 a 5 filas del segundo padre"""
+        rows_to_swap = self.random_row_masks(len(parents1))
+        return np.where(rows_to_swap[:, :, np.newaxis], parents2, parents1)
+    
+    def swap_free_cells(self, boards, rows):
+        """Intercambia dos celdas no fijas (legales) de la fila dada de cada tablero"""
+        idx = np.arange(len(boards))
+        values = boards[idx, rows]
+        size = self.sudoku.size
+        legal = self.legal_swaps(values, rows).reshape(len(boards), size * size)
+        pair = np.argmin(np.where(legal, self.rng.random(legal.shape), np.inf), axis=1)
+        can_swap = legal[idx, pair]
+        idx, rows, pair = idx[can_swap], rows[can_swap], pair[can_swap]
+        col1, col2 = pair // size, pair % size
+        boards[idx, rows, col1], boards[idx, rows, col2] = boards[idx, rows, col2], boards[idx, rows, col1]
+    
+    def shuffle_free_cells(self, boards, rows):
+        """Permuta al azar las celdas no fijas de la fila dada de cada tablero"""
+        idx = np.arange(len(boards))[:, np.newaxis]
+        row_idx = rows[:, np.newaxis]
+        fixed = self.sudoku.fixed_positions[rows]
+        # Celdas libres en orden aleatorio seguidas de las fijas en su orden natural
+        random_order = np.argsort(np.where(fixed, np.inf, self.rng.random(fixed.shape)),
+                                  axis=1, kind='stable')
+        natural_order = np.argsort(np.where(fixed, np.inf, np.arange(self.sudoku.size)), axis=1, kind='stable')
+        boards[idx, row_idx, natural_order] = boards[idx, row_idx, random_order]
+        
+        if not self.config.CONSTRAINT_PROPAGATION:
+            return
+        # Las filas con rellenos legales enumerados se eligen entre ellos
+        for row in np.unique(rows):
+            fills = self.sudoku.row_fills(row)
+            if fills is None:
+                continue
+            which = np.flatnonzero(rows == row)[:, np.newaxis]
+            empty_cols = np.flatnonzero(~self.sudoku.fixed_positions[row])
+            boards[which, row, empty_cols] = fills[self.rng.integers(0, len(fills), len(which))]
+    
+    def mutate_array(self, boards, mutation_rate):
+        """Mutación vectorizada con las mismas tres estrategias que mutate"""
+        n = len(boards)
+        mutated = np.flatnonzero(self.rng.random(n) <= mutation_rate)
+        u1, u2 = self.rng.random((2, len(mutated)))
+        
+        # Estrategia 1: Swap en fila aleatoria
+        swap = mutated[u1 < 0.7]
+        if len(swap):
+            self.mutate_rows_at(boards, swap, self.swap_free_cells)
+        
+        # Estrategia 2: Swap entre dos filas
+        between = mutated[(u1 >= 0.7) & (u2 < 0.9)]
+        if len(between):
+            self.exchange_between_rows(boards, between)
+        
+        # Estrategia 3: Reordenar fila completa
+        reorder = mutated[(u1 >= 0.7) & (u2 >= 0.9)]
+        if len(reorder):
+            self.mutate_rows_at(boards, reorder, self.shuffle_free_cells)
+        
+        return boards
+    
+    def exchange_between_rows(self, boards, indices):
+        """Intercambia ~30% de las celdas libres (legales) entre dos filas de cada tablero indicado"""
+        size = self.sudoku.size
+        row1 = self.rng.integers(0, size, (len(indices), 1))
+        row2 = (row1 + self.rng.integers(1, size, (len(indices), 1))) % size
+        b = indices[:, np.newaxis]
+        cols = np.arange(size)
+        values1 = boards[b, row1, cols]
+        values2 = boards[b, row2, cols]
+        fixed = self.sudoku.fixed_positions
+        mask = ~fixed[row1, cols] & ~fixed[row2, cols] & (self.rng.random((len(indices), size)) < 0.3)
+        if self.config.CONSTRAINT_PROPAGATION:
+            mask &= self.sudoku.allowed(row1, cols, values2) & self.sudoku.allowed(row2, cols, values1)
+        boards[b, row1, cols] = np.where(mask, values2, values1)
+        boards[b, row2, cols] = np.where(mask, values1, values2)
+    
+    def mutate_rows_at(self, boards, indices, operation):
+        """Aplica operation sobre una fila aleatoria de los tableros indicados"""
+        rows = self.rng.integers(0, self.sudoku.size, len(indices))
+        subset = boards[indices]
+        operation(subset, rows)
+        boards[indices] = subset
+    
+    def evolve_array(self):
+        """Evolución del modo array: toda la generación en operaciones vectorizadas"""
+        # Los procesos de un pool (lotes, islas) no pueden crear el suyo: allí se evoluciona en serie
+        if (self.config.PARALLEL_WORKERS and self.crossover_control is None
+                and not multiprocessing.current_process().daemon):
+            return self.evolve_parallel()
+        
+        elite_size = self.config.ELITE_SIZE
+        n_children = self.config.POPULATION_SIZE - elite_size
+        
+        prof = self.profiler
+        
+        t0 = prof and prof.start()
+        parents1 = self.tournament_selection_array(n_children)
+        parents2 = self.tournament_selection_array(n_children)
+        if prof: prof.stop('selection', t0)
+        
+        if self.crossover_control is not None:
+            children, children_fitness = self.breed_adaptive(parents1, parents2, self.adaptive_mutation())
+        else:
+            t0 = prof and prof.start()
+            children = self.crossover_array(self.boards[parents1], self.boards[parents2])
+            if prof: prof.stop('crossover', t0)
+            
+            t0 = prof and prof.start()
+            children = self.mutate_array(children, self.adaptive_mutation())
+            if prof: prof.stop('mutation', t0)
+            
+            t0 = prof and prof.start()
+            children_fitness = self.sudoku.fitness_batch(children)
+            if prof: prof.stop('evaluation', t0)
         
-        self.population = new_population
-        self.population.sort()
-        self.best_individual = self.population[0]
+        t0 = prof and prof.start()
+        if self.converged():
+            slots, winners = self.crowding_slots(children, children_fitness)
+            self.boards[slots] = children[winners]
+            self.fitness_values[slots] = children_fitness[winners]
+            self.offspring = slots
+        else:
+            elite = top_k(self.fitness_values, elite_size)
+            self.boards = np.concatenate([self.boards[elite], children])
+            self.fitness_values = np.concatenate([self.fitness_values[elite], children_fitness])
+            self.offspring = np.arange(elite_size, len(self.fitness_values))
+        self.update_best_array()
+        if prof: prof.stop('sort', t0)
+    
+    def evolve_parallel(self):
+        """Evolución del modo array con los hijos generados por el pool sobre memoria compartida.
+        
+        La población está en el buffer de padres del ParallelBreeder; los
+        procesos escriben los hijos en el otro buffer y aquí sólo se copia la
+        élite (o se hace el reemplazo por torneo restringido) y se alternan.
+        """
+        elite_size = self.config.ELITE_SIZE
+        prof = self.profiler
+        if self.breeder is None:
+            self.breeder = ParallelBreeder(self.sudoku, self.config, self.config.PARALLEL_WORKERS)
+        
+        boards, fitness_values = self.breeder.parents()
+        if self.boards is not boards:
+            # Población nueva (inicialización, inyección, inmigración, checkpoint): pasa al buffer
+            boards[...] = self.boards
+            fitness_values[...] = self.fitness_values
+            self.boards, self.fitness_values = boards, fitness_values
+        
+        t0 = prof and prof.start()
+        children, children_fitness = self.breeder.breed(elite_size, self.adaptive_mutation(), self.rng)
+        if prof: prof.stop('breeding', t0)
+        
+        t0 = prof and prof.start()
+        if self.converged():
+            slots, winners = self.crowding_slots(children[elite_size:], children_fitness[elite_size:])
+            self.boards[slots] = children[elite_size + winners]
+            self.fitness_values[slots] = children_fitness[elite_size + winners]
+            self.offspring = slots
+        else:
+            elite = top_k(self.fitness_values, elite_size)
+            children[:elite_size] = self.boards[elite]
+            children_fitness[:elite_size] = self.fitness_values[elite]
+            self.boards, self.fitness_values = self.breeder.swap()
+            self.offspring = np.arange(elite_size, len(self.fitness_values))
+        self.update_best_array()
+        if prof: prof.stop('sort', t0)
+    
+    def close_parallel(self):
+        """Saca la población de la memoria compartida y termina el pool de evolve_parallel"""
+        if self.breeder is None:
+            return
+        self.boards, self.fitness_values = self.boards.copy(), self.fitness_values.copy()
+        self.breeder.close()
+        self.breeder = None
+    
+    def breed_adaptive(self, parents1, parents2, mutation_rate):
+        """Cruce y mutación con operadores del registro elegidos por los controladores.
+        
+        Cada cruce se premia con la mejora del hijo sobre la media de sus padres
+        y cada mutación con la mejora sobre el hijo sin mutar. Devuelve los
+        hijos (M, n, n) y su fitness.
+        """
+        prof = self.profiler
+        boards = self.population_boards()
+        
+        t0 = prof and prof.start()
+        children = np.empty_like(boards[parents1])
+        choices = self.crossover_control.choose(len(parents1))
+        for members, output in self.crossover_control.apply(self, choices, boards[parents1], boards[parents2]):
+            children[members] = output
+        if prof: prof.stop('crossover', t0)
+        
+        t0 = prof and prof.start()
+        fitness = self.sudoku.fitness_batch(children)
+        if prof: prof.stop('evaluation', t0)
+        self.crossover_control.update(choices, fitness - (self.fitness_values[parents1]
+                                                          + self.fitness_values[parents2]) / 2)
+        
+        mutated = np.flatnonzero(self.rng.random(len(children)) <= mutation_rate)
+        if len(mutated):
+            t0 = prof and prof.start()
+            choices = self.mutation_control.choose(len(mutated))
+            for members, output in self.mutation_control.apply(self, choices, children[mutated]):
+                children[mutated[members]] = output
+            if prof: prof.stop('mutation', t0)
+            
+            t0 = prof and prof.start()
+            mutated_fitness = self.sudoku.fitness_batch(children[mutated])
+            if prof: prof.stop('evaluation', t0)
+            self.mutation_control.update(choices, mutated_fitness - fitness[mutated])
+            fitness[mutated] = mutated_fitness
+        return children, fitness
+    
+    def operator_stats(self):
+        """Estadística por operador de los controladores adaptativos (None si no se usan)"""
+        if self.crossover_control is None:
+            return None
+        return {'crossover': self.crossover_control.stats(), 'mutation': self.mutation_control.stats()}
+    
+    def inject_diversity_array(self, replaced=None):
+        """Inyección de diversidad del modo array"""
+        if replaced is None:
+            elite = top_k(self.fitness_values, self.config.ELITE_SIZE * 2)
+            new_boards = self.random_boards(self.config.POPULATION_SIZE - len(elite))
+            self.boards = np.concatenate([self.boards[elite], new_boards])
+            self.fitness_values = np.concatenate([self.fitness_values[elite],
+                                                  self.sudoku.fitness_batch(new_boards)])
+        else:
+            new_boards = self.random_boards(len(replaced))
+            self.boards[replaced] = new_boards
+            self.fitness_values[replaced] = self.sudoku.fitness_batch(new_boards)
+        self.update_best_array()
+    
+    def evolve(self):
+        """Evolución con mutación adaptativa"""
+        if self.config.ARRAY_POPULATION:
+            self.evolve_array()
+        else:
+            self.evolve_individuals()
         self.generation += 1
         
+        if self.config.MEMETIC and self.generation % self.config.LOCAL_SEARCH_EVERY == 0:
+            t0 = self.profiler and self.profiler.start()
+            self.improve_offspring()
+            if self.profiler: self.profiler.stop('local_search', t0)
+        
         # Detectar estancamiento
         if self.best_individual.fitness > self.best_fitness_ever:
             self.best_fitness_ever = self.best_individual.fitness
@@ -142,57 +602,268 @@ class GeneticAlgorithm:
         else:
             self.stagnation_counter += 1
         
-        # Si hay mucho estancamiento, inyectar diversidad
-        if self.stagnation_counter > 150:
+        prof = self.profiler
+        
+        # Medir cuesta una pasada completa por la población: sólo con el control activo o si el
+        # historial lo pide
+        if self.config.DIVERSITY_CONTROL or (self.config.HISTORY_DIVERSITY and self.history.wants(self.generation)):
+            t0 = prof and prof.start()
+            self.measure_diversity()
+            if prof: prof.stop('metrics', t0)
+        
+        # Si hay mucho estancamiento, inyectar diversidad; con el control activo, sólo si además
+        # la población ha convergido, y en proporción a lo que falta hasta el objetivo
+        if self.converged() and self.stagnation_counter > 50:
+            t0 = prof and prof.start()
+            self.inject_diversity(int(np.ceil(self.diversity_deficit() * (len(self.fitness_values)
+                                                                          - self.config.ELITE_SIZE))))
+            self.stagnation_counter = 0
+            if prof: prof.stop('diversity', t0)
+        elif not self.config.DIVERSITY_CONTROL and self.stagnation_counter > 150:
+            t0 = prof and prof.start()
             self.inject_diversity()
             self.stagnation_counter = 0
+            if prof: prof.stop('diversity', t0)
         
-        self.history.append({
-            'generation': self.generation,
-            'best_fitness': self.best_individual.fitness,
-            'conflicts': self.sudoku.count_conflicts(self.best_individual.board)
-        })
+        if self.history.wants(self.generation):
+            t0 = prof and prof.start()
+            self.record_history()
+            if prof: prof.stop('history', t0)
+        if prof:
+            prof.end_generation(self.generation)
         
         return self.best_individual
     
-    def inject_diversity(self):
-        """Inyecta nuevos individuos aleatorios para escapar de óptimo local"""
+    def record_history(self):
+        """Añade la generación actual al historial; los conflictos se deducen del fitness"""
+        fitness = np.asarray(self.fitness_values)
+        best = self.best_individual.fitness
+        elapsed = self.elapsed + (time.perf_counter() - self.run_start if self.run_start else 0.0)
+        if self.diversity_generation == self.generation:
+            diversity, distance = self.diversity, self.distance_to_best
+        else:
+            diversity = distance = np.nan
+        self.history.append(self.generation, best, fitness.mean(), fitness.min(),
+                            self.sudoku.max_fitness - best, diversity, distance, elapsed)
+    
+    def evolve_individuals(self):
+        """Evolución de la población de objetos Individual"""
+        population = self.population
+        prof = self.profiler
+        
+        t0 = prof and prof.start()
+        elite = [population[i] for i in top_k(self.fitness_values, self.config.ELITE_SIZE)]
+        new_population = []
+        n_children = self.config.POPULATION_SIZE - len(elite)
+        # Todos los torneos de la generación de una vez, por índices
+        parents = tournament(self.fitness_values, 2 * n_children, self.config.TOURNAMENT_SIZE, self.rng)
+        parents = parents.reshape(n_children, 2)
+        if prof: prof.stop('selection', t0)
+        
+        if self.crossover_control is not None:
+            boards, fitness = self.breed_adaptive(parents[:, 0], parents[:, 1], self.adaptive_mutation())
+            new_population = [Individual(board, int(value)) for board, value in zip(boards, fitness)]
+            return self.replace_population(elite, new_population)
+        
+        t0 = prof and prof.start()
+        parents = parents.tolist()
+        # Sorteos de cruce y mutación de toda la generación en bloque
+        crossover_rows = self.random_row_masks(n_children)
+        mutation_draws = self.rng.random((n_children, self.sudoku.size + 6))
+        if prof: prof.stop('selection', t0)
+        
+        # Mutación adaptativa
+        original_mutation = self.config.MUTATION_RATE
+        self.config.MUTATION_RATE = self.adaptive_mutation()
+        
+        if prof is None:
+            for i, (index1, index2) in enumerate(parents):
+                child = self.crossover(population[index1], population[index2], crossover_rows[i])
+                child = self.mutate(child, mutation_draws[i], in_place=True)
+                new_population.append(child)
+        else:
+            for i, (index1, index2) in enumerate(parents):
+                t0 = prof.start()
+                child = self.crossover(population[index1], population[index2], crossover_rows[i])
+                prof.stop('crossover', t0)
+                t0 = prof.start()
+                child = self.mutate(child, mutation_draws[i], in_place=True)
+                prof.stop('mutation', t0)
+                new_population.append(child)
+        
+        # Restaurar tasa de mutación original
+        self.config.MUTATION_RATE = original_mutation
+        
+        self.replace_population(elite, new_population)
+    
+    def replace_population(self, elite, children):
+        """Reemplazo del modo Individual: élite más hijos, o por torneo restringido si ha convergido"""
+        prof = self.profiler
+        t0 = prof and prof.start()
+        if self.converged():
+            children_fitness = np.fromiter((child.fitness for child in children), dtype=np.int64,
+                                           count=len(children))
+            slots, winners = self.crowding_slots(np.stack([child.board for child in children]), children_fitness)
+            population = list(self.population)
+            for slot, winner in zip(slots, winners):
+                population[slot] = children[winner]
+            self.set_population(population)
+            self.offspring = slots
+        else:
+            self.set_population(elite + children)
+            self.offspring = np.arange(len(elite), len(self.population))
+        if prof: prof.stop('sort', t0)
+    
+    def improve_offspring(self):
+        """Modo memético: búsqueda local sobre los mejores descendientes de la generación"""
+        if self.local_search is None:
+            self.local_search = TabuSearch(self.sudoku, self.config.CONSTRAINT_PROPAGATION,
+                                           self.config.TABU_TENURE, self.rng)
+        
+        # Con reemplazo por torneo restringido los hijos no ocupan un tramo fijo de la población
+        offspring = self.offspring
+        if offspring is None:
+            return
+        chosen = offspring[top_k(self.fitness_values[offspring], self.config.LOCAL_SEARCH_OFFSPRING)]
+        for index in chosen:
+            board = self.boards[index] if self.config.ARRAY_POPULATION else self.population[index].board
+            improved, conflicts = self.local_search.improve(board, self.config.LOCAL_SEARCH_BUDGET)
+            fitness = self.sudoku.max_fitness - conflicts
+            if fitness <= self.fitness_values[index]:
+                continue
+            self.fitness_values[index] = fitness
+            if self.config.ARRAY_POPULATION:
+                self.boards[index] = improved
+            else:
+                self.population[index] = Individual(improved, fitness)
+            if fitness > self.best_individual.fitness:
+                self.best_individual = Individual(improved.copy(), fitness)
+    
+    def inject_diversity(self, n=None):
+        """Inyecta nuevos individuos aleatorios para escapar de óptimo local.
+        
+        Sin n se conserva sólo la élite doble. Con n se sustituyen los n
+        individuos más parecidos al mejor (según la última medida de
+        diversidad), sin tocar la élite.
+        """
+        replaced = None
+        if n is not None:
+            candidates = np.setdiff1d(np.arange(len(self.fitness_values)),
+                                      top_k(self.fitness_values, self.config.ELITE_SIZE))
+            replaced = candidates[np.argsort(self.distances[candidates], kind='stable')[:n]]
+        
+        if self.config.ARRAY_POPULATION:
+            return self.inject_diversity_array(replaced)
+        
+        if replaced is not None:
+            population = list(self.population)
+            for index, board in zip(replaced, self.random_boards(len(replaced))):
+                population[index] = self.evaluate(board)
+            return self.set_population(population)
+        
         # Mantener la élite
-        elite_size = self.config.ELITE_SIZE * 2
-        elite = self.population[:elite_size]
+        elite = [self.population[i] for i in top_k(self.fitness_values, self.config.ELITE_SIZE * 2)]
         
         # Generar nuevos individuos aleatorios
-        new_individuals = []
-        for _ in range(self.config.POPULATION_SIZE - elite_size):
-            board = np.copy(self.sudoku.initial_board)
-            
-            for row in range(9):
-                fixed_nums = board[row][board[row] != 0].tolist()
-                missing = [n for n in range(1, 10) if n not in fixed_nums]
-                random.shuffle(missing)
-                
-                idx = 0
-                for col in range(9):
-                    if board[row, col] == 0:
-                        board[row, col] = missing[idx]
-                        idx += 1
-            
-            individual = Individual(board, self.sudoku)
-            new_individuals.append(individual)
+        new_individuals = [self.evaluate(board)
+                           for board in self.random_boards(self.config.POPULATION_SIZE - len(elite))]
         
-        self.population = elite + new_individuals
-        self.population.sort()
+        self.set_population(elite + new_individuals)
+    
+    def emigrants(self, n):
+        """Copia de los tableros de los n mejores individuos"""
+        best = top_k(self.fitness_values, n)
+        if self.config.ARRAY_POPULATION:
+            return self.boards[best].copy()
+        return np.array([self.population[i].board for i in best])
+    
+    def immigrate(self, boards):
+        """Sustituye a los peores individuos por los tableros recibidos"""
+        n = len(boards)
+        if n == 0:
+            return
+        worst = bottom_k(self.fitness_values, n)
+        if self.config.ARRAY_POPULATION:
+            self.boards[worst] = boards
+            self.fitness_values[worst] = self.sudoku.fitness_batch(boards)
+            self.update_best_array()
+            return
+        population = list(self.population)
+        for index, board in zip(worst, boards):
+            population[index] = self.evaluate(np.copy(board))
+        self.set_population(population)
     
-    def solve(self):
-        """Ejecuta el algoritmo genético hasta encontrar solución"""
-        self.initialize_population()
+    def result(self):
+        """Resumen de la ejecución: solución, generaciones, tiempo y perfil por fase"""
+        board = np.copy(self.best_individual.board)
+        conflicts = self.sudoku.count_conflicts(board)
+        return {
+            'solution': board,
+            'solved': conflicts == 0,
+            'generations': self.generation,
+            'fitness': self.best_individual.fitness,
+            'conflicts': conflicts,
+            'elapsed': self.elapsed,
+            'profile': self.profiler.summary() if self.profiler else None,
+            'operators': self.operator_stats(),
+            'fitness_cache': self.sudoku.cache_info() if self.sudoku.cache_size else None
+        }
+    
+    def save_checkpoint(self, path=None):
+        """Guarda el estado de la ejecución (por defecto en Config.CHECKPOINT_PATH)"""
+        from checkpoint import save_checkpoint
+        save_checkpoint(self, path or self.config.CHECKPOINT_PATH)
+    
+    def load_checkpoint(self, path=None):
+        """Restaura el estado guardado con save_checkpoint"""
+        from checkpoint import load_checkpoint
+        load_checkpoint(self, path or self.config.CHECKPOINT_PATH)
+    
+    def solve(self, resume_from=None, seed_boards=None):
+        """Ejecuta el algoritmo genético hasta encontrar solución.
+        
+        Con resume_from continúa desde ese checkpoint en lugar de inicializar.
+        seed_boards (p. ej. élites de un intento anterior) sustituyen a los
+        peores individuos de la población inicial.
+        """
+        self.run_start = time.perf_counter()
+        try:
+            return self.run(resume_from, seed_boards)
+        finally:
+            self.close_parallel()
+            self.elapsed += time.perf_counter() - self.run_start
+            self.run_start = None
+            if self.config.VERBOSE and self.profiler:
+                print("\n" + self.profiler.report())
+            if self.config.VERBOSE and self.crossover_control is not None:
+                print("\n" + self.crossover_control.report("Cruce"))
+                print("\n" + self.mutation_control.report("Mutación"))
+            if self.config.VERBOSE and self.sudoku.cache_size:
+                info = self.sudoku.cache_info()
+                print(f"Caché de fitness: {info['hits']} aciertos, {info['misses']} fallos "
+                      f"({info['hit_rate']:.1%})")
+    
+    def run(self, resume_from=None, seed_boards=None):
+        """Bucle principal de solve"""
+        t0 = self.profiler and self.profiler.start()
+        if resume_from:
+            self.load_checkpoint(resume_from)
+        else:
+            self.initialize_population()
+            if seed_boards is not None:
+                self.immigrate(seed_boards)
+                self.best_fitness_ever = self.best_individual.fitness
+        if self.profiler: self.profiler.stop('initialization', t0)
         
         if self.config.VERBOSE:
-            print(f"Generación 0: Fitness = {self.best_individual.fitness}, Conflictos = {self.sudoku.count_conflicts(self.best_individual.board)}")
+            print(f"Generación {self.generation}: Fitness = {self.best_individual.fitness}, Conflictos = {self.sudoku.count_conflicts(self.best_individual.board)}")
         
-        for gen in range(self.config.GENERATIONS):
+        for gen in range(self.generation, self.config.GENERATIONS):
             best = self.evolve()
             
+            if self.config.CHECKPOINT_EVERY and self.generation % self.config.CHECKPOINT_EVERY == 0:
+                self.save_checkpoint()
+            
             # Callback para visualización en tiempo real
             if self.callback and gen % self.config.SHOW_EVERY == 0:
                 should_continue = self.callback(self)
@@ -203,14 +874,15 @@ class GeneticAlgorithm:
                 conflicts = self.sudoku.count_conflicts(best.board)
                 print(f"Generación {self.generation}: Fitness = {best.fitness}, Conflictos = {conflicts}, Estancamiento = {self.stagnation_counter}")
             
-            if self.sudoku.is_solved(best.board):
+            if best.fitness == self.sudoku.max_fitness:
                 if self.config.VERBOSE:
                     print(f"\n¡Sudoku resuelto en la generación {self.generation}!")
                 if self.callback:
                     self.callback(self)
-                return best.board
+                return np.copy(best.board)
         
         if self.config.VERBOSE:
             print(f"\nNo se encontró solución completa. Mejor fitness: {self.best_individual.fitness}")
         
-        return self.best_individual.board
\ No newline at end of file
+        # Copia: el llamador no comparte el tablero con la población
+        return np.copy(self.best_individual.board)
\ No newline at end of file
@@ -1,10 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
-from sudoku import Sudoku
+from sudoku import Sudoku, DIGIT_CHARS
 from genetic_algorithm import GeneticAlgorithm
 from config import Config
+from puzzles import EXAMPLES, generate_puzzle
+import queue
 import threading
+import time
 
 class SudokuGUI:
     def __init__(self, root):
@@ -14,11 +17,19 @@ class SudokuGUI:
         
         # Variables
         self.cells = []
+        self.size = 9
         self.sudoku = None
         self.ga = None
         self.is_running = False
         self.is_paused = False
         
+        # Comunicación hilo del AG -> hilo de Tk. Las instantáneas se acotan a la
+        # más reciente (si la GUI va atrasada se descartan las viejas); los
+        # eventos de fin o error nunca se descartan.
+        self.snapshots = queue.Queue(maxsize=1)
+        self.events = queue.Queue()
+        self.displayed = None  # Valores mostrados actualmente en cada celda
+        
         # Colores
         self.color_fixed = "#000000"
         self.color_generated = "#0066CC"
@@ -27,6 +38,7 @@ class SudokuGUI:
         
         self.setup_ui()
         self.load_example_sudoku('facil')
+        self.poll_updates()
         
     def setup_ui(self):
         # Frame principal con grid
@@ -72,6 +84,9 @@ class SudokuGUI:
         tk.Button(btn_frame, text="Difícil", command=lambda: self.load_example_sudoku('dificil'),
                  width=10, height=2, bg='#F44336', fg='white', 
                  font=('Arial', 10, 'bold')).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="16x16", command=lambda: self.load_generated_sudoku(4),
+                 width=10, height=2, bg='#9C27B0', fg='white', 
+                 font=('Arial', 10, 'bold')).pack(side=tk.LEFT, padx=5)
         
         tk.Button(examples_frame, text="Limpiar Tablero", command=self.clear_board,
                  width=32, height=2, bg='#607D8B', fg='white', 
@@ -156,19 +171,28 @@ class SudokuGUI:
                 font=('Arial', 14, 'bold'), bg='#F0F0F0', fg='#2196F3', 
                 anchor='center').pack(fill=tk.X, pady=10)
         
-    def create_board(self):
-        """Crea el tablero de sudoku con Entry widgets"""
-        cell_size = 50
+    def create_board(self, size=9):
+        """Crea el tablero de sudoku de lado size con Entry widgets"""
+        # Reconstruir si ya existía un tablero (p. ej. al pasar de 9x9 a 16x16)
+        for row in self.cells:
+            for entry in row:
+                entry.destroy()
+        self.board_canvas.delete('all')
+        self.cells = []
+        self.size = size
+        box_size = int(np.sqrt(size))
+        cell_size = (460 - 2 * box_size) // size
+        board_width = size * cell_size + box_size * 2
         
-        for i in range(9):
+        for i in range(size):
             row = []
-            for j in range(9):
+            for j in range(size):
                 # Calcular posición
-                x = j * cell_size + (j // 3) * 2
-                y = i * cell_size + (i // 3) * 2
+                x = j * cell_size + (j // box_size) * 2
+                y = i * cell_size + (i // box_size) * 2
                 
                 # Crear Entry
-                entry = tk.Entry(self.board_canvas, font=('Arial', 20, 'bold'), 
+                entry = tk.Entry(self.board_canvas, font=('Arial', 20 * 9 // size, 'bold'), 
                                justify='center', relief=tk.SOLID, bd=1,
                                bg=self.color_bg_empty, width=3)
                 
@@ -183,11 +207,11 @@ class SudokuGUI:
             
             self.cells.append(row)
         
-        # Dibujar líneas gruesas para las cajas 3x3
-        for i in range(4):
-            x = i * 3 * cell_size + i * 2
-            self.board_canvas.create_line(x, 0, x, 460, width=3, fill='#000000')
-            self.board_canvas.create_line(0, x, 460, x, width=3, fill='#000000')
+        # Dibujar líneas gruesas para las cajas
+        for i in range(box_size + 1):
+            x = i * box_size * cell_size + i * 2
+            self.board_canvas.create_line(x, 0, x, board_width, width=3, fill='#000000')
+            self.board_canvas.create_line(0, x, board_width, x, width=3, fill='#000000')
         
     def create_param_slider(self, parent, label, min_val, max_val, default, var_name, is_float=False):
         frame = tk.Frame(parent, bg='#F0F0F0')
@@ -213,31 +237,31 @@ class SudokuGUI:
         
     def validate_input(self, event):
         """Valida la entrada del usuario"""
-        if event.char and not event.char.isdigit():
-            return 'break'
-        if event.char == '0':
+        if event.char and event.char.isprintable() and event.char.upper() not in DIGIT_CHARS[:self.size]:
             return 'break'
     
     def get_board(self):
         """Obtiene el tablero actual"""
         board = []
-        for i in range(9):
+        for i in range(self.size):
             row = []
-            for j in range(9):
-                val = self.cells[i][j].get().strip()
-                row.append(int(val) if val else 0)
+            for j in range(self.size):
+                val = self.cells[i][j].get().strip().upper()
+                row.append(DIGIT_CHARS.index(val) + 1 if val else 0)
             board.append(row)
         return board
     
     def set_board(self, board, fixed_positions=None):
         """Actualiza el tablero visual"""
-        for i in range(9):
-            for j in range(9):
+        if len(board) != self.size:
+            self.create_board(len(board))
+        for i in range(self.size):
+            for j in range(self.size):
                 self.cells[i][j].config(state='normal')
                 self.cells[i][j].delete(0, tk.END)
                 
                 if board[i][j] != 0:
-                    self.cells[i][j].insert(0, str(board[i][j]))
+                    self.cells[i][j].insert(0, DIGIT_CHARS[board[i][j] - 1])
                     
                     if fixed_positions is not None and fixed_positions[i][j]:
                         self.cells[i][j].config(fg=self.color_fixed, 
@@ -248,6 +272,17 @@ class SudokuGUI:
                                                bg=self.color_bg_empty)
                 else:
                     self.cells[i][j].config(fg='#000000', bg=self.color_bg_empty)
+        self.displayed = np.array(board)
+    
+    def update_cells(self, board):
+        """Actualiza sólo las celdas cuyo valor ha cambiado desde el último refresco"""
+        for i, j in np.argwhere(board != self.displayed):
+            cell = self.cells[i][j]
+            cell.delete(0, tk.END)
+            if board[i, j] != 0:
+                cell.insert(0, DIGIT_CHARS[board[i, j] - 1])
+                cell.config(fg=self.color_generated)
+        self.displayed = board
     
     def clear_board(self):
         """Limpia el tablero"""
@@ -255,14 +290,15 @@ class SudokuGUI:
             messagebox.showwarning("Advertencia", "Detén la ejecución antes de limpiar")
             return
         
-        for i in range(9):
-            for j in range(9):
+        for i in range(self.size):
+            for j in range(self.size):
                 self.cells[i][j].config(state='normal')
                 self.cells[i][j].delete(0, tk.END)
                 self.cells[i][j].config(bg=self.color_bg_empty, fg='#000000')
+        self.displayed = np.zeros((self.size, self.size), dtype=int)
         
         self.generation_var.set("Generación: 0")
-        self.fitness_var.set("Fitness: 0 / 243")
+        self.fitness_var.set(f"Fitness: 0 / {3 * self.size ** 2}")
         self.conflicts_var.set("Conflictos: 0")
         self.status_var.set("Estado: Esperando...")
     
@@ -272,48 +308,23 @@ class SudokuGUI:
             messagebox.showwarning("Advertencia", "Detén la ejecución antes de cargar un ejemplo")
             return
         
-        sudokus = {
-            'facil': [
-                [5,3,0,0,7,0,0,0,0],
-                [6,0,0,1,9,5,0,0,0],
-                [0,9,8,0,0,0,0,6,0],
-                [8,0,0,0,6,0,0,0,3],
-                [4,0,0,8,0,3,0,0,1],
-                [7,0,0,0,2,0,0,0,6],
-                [0,6,0,0,0,0,2,8,0],
-                [0,0,0,4,1,9,0,0,5],
-                [0,0,0,0,8,0,0,7,9]
-            ],
-            'medio': [
-                [0,0,0,6,0,0,4,0,0],
-                [7,0,0,0,0,3,6,0,0],
-                [0,0,0,0,9,1,0,8,0],
-                [0,0,0,0,0,0,0,0,0],
-                [0,5,0,1,8,0,0,0,3],
-                [0,0,0,3,0,6,0,4,5],
-                [0,4,0,2,0,0,0,6,0],
-                [9,0,3,0,0,0,0,0,0],
-                [0,2,0,0,0,0,1,0,0]
-            ],
-            'dificil': [
-                [0,0,0,0,0,0,0,1,2],
-                [0,0,0,0,3,5,0,0,0],
-                [0,0,0,6,0,0,0,7,0],
-                [7,0,0,0,0,0,3,0,0],
-                [0,0,0,4,0,0,8,0,0],
-                [1,0,0,0,0,0,0,0,0],
-                [0,0,0,1,2,0,0,0,0],
-                [0,8,0,0,0,0,0,4,0],
-                [0,5,0,0,0,0,6,0,0]
-            ]
-        }
-        
-        board = sudokus[difficulty]
+        self.load_board(EXAMPLES[difficulty])
+    
+    def load_generated_sudoku(self, box_size):
+        """Carga un sudoku aleatorio de lado box_size² con la mitad de celdas vacías"""
+        if self.is_running:
+            messagebox.showwarning("Advertencia", "Detén la ejecución antes de cargar un ejemplo")
+            return
+        
+        self.load_board(generate_puzzle(box_size))
+    
+    def load_board(self, board):
+        """Muestra un tablero nuevo y reinicia las estadísticas"""
         self.sudoku = Sudoku(board)
-        self.set_board(board, self.sudoku.fixed_positions)
+        self.set_board(board, self.sudoku.given_positions)
         
         self.generation_var.set("Generación: 0")
-        self.fitness_var.set("Fitness: 0 / 243")
+        self.fitness_var.set(f"Fitness: 0 / {self.sudoku.max_fitness}")
         self.conflicts_var.set("Conflictos: 0")
         self.status_var.set("Estado: Sudoku cargado")
     
@@ -329,6 +340,7 @@ class SudokuGUI:
         self.sudoku = Sudoku(board)
         self.is_running = True
         self.is_paused = False
+        self.set_board(self.sudoku.givens, self.sudoku.given_positions)
         
         # Configurar botones
         self.btn_start.config(state=tk.DISABLED)
@@ -355,42 +367,55 @@ class SudokuGUI:
         thread.start()
     
     def solve_thread(self):
-        """Thread para ejecutar el AG"""
+        """Thread para ejecutar el AG (no toca Tk: se comunica por las colas)"""
         try:
             solution = self.ga.solve()
-            self.root.after(0, self.on_solution_found, solution)
+            self.events.put((self.on_solution_found, solution))
         except Exception as e:
-            self.root.after(0, self.on_error, str(e))
+            self.events.put((self.on_error, str(e)))
     
     def update_callback(self, ga):
-        """Callback para actualizar la GUI durante la ejecución"""
-        if self.is_paused:
-            while self.is_paused and self.is_running:
-                import time
-                time.sleep(0.1)
+        """Callback del AG: publica una instantánea compacta y vuelve enseguida"""
+        while self.is_paused and self.is_running:
+            time.sleep(0.1)
         
         if not self.is_running:
             return False
         
-        # Actualizar GUI desde el thread principal
-        self.root.after(0, self.update_display, ga)
+        best = ga.best_individual
+        snapshot = (ga.generation, best.fitness, best.board.copy())
+        # Sustituir la instantánea pendiente si la GUI aún no la ha consumido
+        try:
+            self.snapshots.get_nowait()
+        except queue.Empty:
+            pass
+        self.snapshots.put_nowait(snapshot)
         return True
     
-    def update_display(self, ga):
-        """Actualiza la visualización del tablero y estadísticas"""
-        board = ga.best_individual.board
-        conflicts = self.sudoku.count_conflicts(board)
-        
-        # Actualizar estadísticas
-        self.generation_var.set(f"Generación: {ga.generation}")
-        self.fitness_var.set(f"Fitness: {ga.best_individual.fitness} / 243")
-        self.conflicts_var.set(f"Conflictos: {conflicts}")
+    def poll_updates(self):
+        """Bucle de refresco en el hilo de Tk a Config.GUI_FPS fotogramas por segundo"""
+        while True:
+            try:
+                handler, arg = self.events.get_nowait()
+            except queue.Empty:
+                break
+            handler(arg)
         
-        # Actualizar tablero
-        self.set_board(board, self.sudoku.fixed_positions)
+        try:
+            snapshot = self.snapshots.get_nowait()
+        except queue.Empty:
+            snapshot = None
+        if snapshot is not None and self.is_running:
+            self.update_display(*snapshot)
         
-        # Forzar actualización
-        self.root.update_idletasks()
+        self.root.after(1000 // Config.GUI_FPS, self.poll_updates)
+    
+    def update_display(self, generation, fitness, board):
+        """Actualiza las estadísticas y las celdas cambiadas del tablero"""
+        self.generation_var.set(f"Generación: {generation}")
+        self.fitness_var.set(f"Fitness: {fitness} / {self.sudoku.max_fitness}")
+        self.conflicts_var.set(f"Conflictos: {self.sudoku.max_fitness - fitness}")
+        self.update_cells(board)
     
     def pause_solving(self):
         """Pausa/reanuda la ejecución"""
@@ -428,17 +453,17 @@ class SudokuGUI:
             messagebox.showinfo("¡Éxito!", 
                               f"¡Sudoku resuelto exitosamente!\n\n"
                               f"Generaciones: {self.ga.generation}\n"
-                              f"Fitness final: {self.ga.best_individual.fitness}/243")
+                              f"Fitness final: {self.ga.best_individual.fitness}/{self.sudoku.max_fitness}")
         else:
             self.status_var.set(f"Estado: Solución parcial ({conflicts} conflictos)")
             messagebox.showwarning("Solución parcial", 
                                  f"No se encontró solución completa.\n\n"
                                  f"Conflictos restantes: {conflicts}\n"
                                  f"Generaciones utilizadas: {self.ga.generation}\n"
-                                 f"Fitness: {self.ga.best_individual.fitness}/243\n\n"
+                                 f"Fitness: {self.ga.best_individual.fitness}/{self.sudoku.max_fitness}\n\n"
                                  f"Intenta ajustar los parámetros y volver a ejecutar.")
         
-        self.set_board(solution, self.sudoku.fixed_positions)
+        self.set_board(solution, self.sudoku.given_positions)
         
         self.btn_start.config(state=tk.NORMAL)
         self.btn_pause.config(state=tk.DISABLED)
@@ -0,0 +1,88 @@
+"""Historial de la evolución en columnas NumPy preasignadas"""
+import numpy as np
+
+class History:
+    """Una columna por métrica, preasignada y ampliada por bloques de chunk filas.
+    
+    Sólo se registra una de cada stride generaciones; las columnas se leen como
+    vistas con history['campo'] y se exportan en bloque a CSV o .npy.
+    """
+    
+    FIELDS = (
+        ('generation', np.int64),
+        ('best_fitness', np.int64),
+        ('mean_fitness', np.float64),
+        ('worst_fitness', np.int64),
+        ('conflicts', np.int64),
+        ('diversity', np.float64),  # Entropía media por celda libre (0 = convergida, 1 = uniforme)
+        ('distance', np.float64),  # Distancia de Hamming media al mejor (fracción de celdas libres)
+        ('elapsed', np.float64),  # Segundos de ejecución acumulados
+    )
+    
+    def __init__(self, stride=1, chunk=4096):
+        self.stride = stride
+        self.chunk = chunk
+        self.size = 0
+        self.columns = {name: np.zeros(chunk, dtype=dtype) for name, dtype in self.FIELDS}
+    
+    def __len__(self):
+        return self.size
+    
+    def __getitem__(self, name):
+        return self.columns[name][:self.size]
+    
+    def wants(self, generation):
+        """Indica si la generación cae en el muestreo"""
+        return generation % self.stride == 0
+    
+    def append(self, generation, best_fitness, mean_fitness, worst_fitness, conflicts, diversity, distance,
+               elapsed):
+        if self.size == len(self.columns['generation']):
+            self.grow(self.size + self.chunk)
+        row = self.size
+        for (name, _), value in zip(self.FIELDS, (generation, best_fitness, mean_fitness, worst_fitness,
+                                                  conflicts, diversity, distance, elapsed)):
+            self.columns[name][row] = value
+        self.size += 1
+    
+    def grow(self, capacity):
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+    
+    def last(self):
+        """Última fila como diccionario (None si está vacío)"""
+        if not self.size:
+            return None
+        return {name: self.columns[name][self.size - 1].item() for name, _ in self.FIELDS}
+    
+    def load(self, columns):
+        """Sustituye el contenido por columnas completas (p. ej. de un checkpoint).
+        
+        Las columnas ausentes se rellenan con ceros.
+        """
+        size = len(columns['generation'])
+        self.size = 0
+        self.grow(max(size, self.chunk))
+        for name, _ in self.FIELDS:
+            if name in columns:
+                self.columns[name][:size] = columns[name]
+        self.size = size
+    
+    def as_array(self):
+        """Copia como array estructurado (una fila por generación registrada)"""
+        table = np.zeros(self.size, dtype=list(self.FIELDS))
+        for name, _ in self.FIELDS:
+            table[name] = self[name]
+        return table
+    
+    def save(self, path):
+        """Exporta a .npy como array estructurado"""
+        np.save(path, self.as_array())
+    
+    def to_csv(self, path):
+        """Exporta a CSV con cabecera"""
+        formats = ['%d' if np.issubdtype(dtype, np.integer) else '%.6g' for _, dtype in self.FIELDS]
+        np.savetxt(path, self.as_array(), delimiter=',', fmt=formats,
+                   header=','.join(name for name, _ in self.FIELDS), comments='')
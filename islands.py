@@ -0,0 +1,113 @@
+import multiprocessing
+import queue
+import time
+import numpy as np
+from config import Config
+from genetic_algorithm import GeneticAlgorithm, Individual
+
+def neighbors(island, n_islands, topology):
+    """Islas destino de los emigrantes de una isla"""
+    if topology == 'ring':
+        return [(island + 1) % n_islands] if n_islands > 1 else []
+    if topology == 'full':
+        return [other for other in range(n_islands) if other != island]
+    raise ValueError(f"Topología de migración desconocida: {topology}")
+
+def run_island(island, sudoku, config, seed_sequence, inboxes, progress, stop_event):
+    """Evoluciona una isla hasta resolver, agotar generaciones o recibir la señal de parada"""
+    # Cada isla usa un flujo aleatorio independiente derivado de Config.SEED
+    ga = GeneticAlgorithm(sudoku, config, rng=np.random.default_rng(seed_sequence))
+    ga.initialize_population()
+    targets = neighbors(island, len(inboxes), config.MIGRATION_TOPOLOGY)
+    
+    for gen in range(config.GENERATIONS):
+        if stop_event.is_set():
+            break
+        
+        best = ga.evolve()
+        
+        if sudoku.is_solved(best.board):
+            stop_event.set()
+            break
+        
+        if gen % config.MIGRATION_INTERVAL == 0:
+            migrants = ga.emigrants(config.MIGRATION_SIZE)
+            for target in targets:
+                inboxes[target].put(migrants)
+            # Recibir sin bloquear los emigrantes pendientes de otras islas
+            arrivals = []
+            while True:
+                try:
+                    arrivals.extend(inboxes[island].get_nowait())
+                except queue.Empty:
+                    break
+            ga.immigrate(np.array(arrivals[:config.POPULATION_SIZE // 2]))
+        
+        if gen % config.SHOW_EVERY == 0:
+            progress.put((island, ga.generation, best.board.copy(), best.fitness))
+    
+    return island, ga.generation, ga.best_individual.board, ga.best_individual.fitness
+
+class IslandModel:
+    """Algoritmo genético con K subpoblaciones en paralelo y migración entre ellas"""
+    
+    def __init__(self, sudoku, config=Config(), callback=None):
+        self.sudoku = sudoku
+        self.config = config
+        self.callback = callback
+        self.best_individual = None
+        self.best_island = None
+        self.generation = 0
+        self.island_results = []
+    
+    def solve(self):
+        """Ejecuta las islas en un pool de procesos; la primera que resuelve detiene al resto"""
+        n_islands = self.config.ISLANDS
+        island_config = Config()
+        island_config.__dict__.update(self.config.__dict__)
+        island_config.VERBOSE = False
+        
+        with multiprocessing.Manager() as manager, multiprocessing.Pool(n_islands) as pool:
+            inboxes = [manager.Queue() for _ in range(n_islands)]
+            progress = manager.Queue()
+            stop_event = manager.Event()
+            seeds = np.random.SeedSequence(self.config.SEED).spawn(n_islands)
+            pending = [pool.apply_async(run_island, (island, self.sudoku, island_config, seeds[island],
+                                                     inboxes, progress, stop_event))
+                       for island in range(n_islands)]
+            
+            while not all(result.ready() for result in pending):
+                self.report_progress(progress, stop_event)
+                time.sleep(0.05)
+            self.report_progress(progress, stop_event)
+            
+            self.island_results = [result.get() for result in pending]
+        
+        island, generation, board, fitness = max(self.island_results, key=lambda result: result[3])
+        self.best_island = island
+        self.generation = generation
+        self.best_individual = Individual(board, fitness)
+        
+        if self.config.VERBOSE:
+            status = "resuelto" if self.sudoku.is_solved(board) else "sin solución completa"
+            print(f"Isla {island}: {status} en la generación {generation} (fitness = {fitness})")
+        if self.callback:
+            self.callback(self)
+        
+        return board
+    
+    def report_progress(self, progress, stop_event):
+        """Vacía la cola de progreso y llama al callback con el mejor tablero visto"""
+        while True:
+            try:
+                island, generation, board, fitness = progress.get_nowait()
+            except queue.Empty:
+                break
+            self.generation = max(self.generation, generation)
+            if self.best_individual is None or fitness > self.best_individual.fitness:
+                self.best_individual = Individual(board, fitness)
+                self.best_island = island
+            if self.config.VERBOSE:
+                print(f"Isla {island} - Generación {generation}: Fitness = {fitness}")
+            if self.callback and not self.callback(self):
+                stop_event.set()
@@ -0,0 +1,275 @@
+"""Núcleos numéricos calientes del AG con dos implementaciones intercambiables.
+
+- 'numpy': operaciones vectorizadas de NumPy (siempre disponible).
+- 'numba': los mismos cálculos como bucles compilados con numba, si está
+  instalado. Evitan la sobrecarga de NumPy sobre arrays pequeños (una fila,
+  un tablero), que es lo que domina en el modo Individual.
+
+Los dos backends devuelven exactamente los mismos resultados y no consumen
+números aleatorios: el azar se sortea fuera con el generador del AG, de
+modo que una semilla da la misma ejecución con cualquiera de ellos.
+check_backends() los compara sobre tableros aleatorios.
+"""
+import time
+from types import SimpleNamespace
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba es opcional
+    numba = None
+
+# Implementación NumPy
+
+def count_conflicts_numpy(boards, units, size):
+    """Conflictos de N tableros (N, n * n): suma sobre unidades de n - valores distintos"""
+    values = np.sort(boards[:, units], axis=2)
+    # Valores distintos por unidad = 1 + número de saltos en la unidad ordenada
+    distinct = 1 + np.count_nonzero(np.diff(values, axis=2), axis=2)
+    return (size - distinct).sum(axis=1)
+
+def unit_counts_numpy(board, units, size):
+    """Cuenta de cada dígito (0..n) en cada unidad de un tablero (n * n): (3n, n + 1)"""
+    n_units = len(units)
+    index = (np.arange(n_units)[:, np.newaxis] * (size + 1) + board[units]).ravel()
+    return np.bincount(index, minlength=n_units * (size + 1)).astype(np.int16).reshape(n_units, size + 1)
+
+# Cambios de hasta este número de celdas (los swaps) se aplican celda a celda:
+# con tan pocas cuentas tocadas cuesta menos que las llamadas a NumPy
+APPLY_CHANGES_LOOP_CELLS = 4
+
+def apply_changes_numpy(board, counts, units_of_cell, rows, cols, values):
+    """Escribe values en (rows, cols), actualiza counts y devuelve el cambio de fitness.
+    
+    Sólo se leen y escriben las cuentas de las unidades que tocan las celdas
+    cambiadas; las celdas cuyo valor no cambia suman y restan lo mismo y no cuentan.
+    """
+    if len(rows) <= APPLY_CHANGES_LOOP_CELLS:
+        return apply_changes_cells(board, counts, units_of_cell, rows, cols, values)
+    units = units_of_cell[rows * board.shape[1] + cols]
+    seen = np.zeros(len(counts), dtype=np.int64)
+    seen[units] = 1
+    touched = np.flatnonzero(seen)
+    # Índices en las cuentas de las unidades tocadas, numeradas de 0 en adelante
+    local = (np.cumsum(seen) - 1)[units] * counts.shape[1]
+    width = len(touched) * counts.shape[1]
+    delta = (np.bincount((local + values[:, np.newaxis]).ravel(), minlength=width)
+             - np.bincount((local + board[rows, cols][:, np.newaxis]).ravel(), minlength=width))
+    before = counts[touched]
+    after = before + delta.reshape(before.shape)
+    counts[touched] = after
+    board[rows, cols] = values
+    # Cada valor distinto adicional en una unidad es un conflicto menos
+    return int(np.count_nonzero(after) - np.count_nonzero(before))
+
+def apply_changes_cells(board, counts, units_of_cell, rows, cols, values):
+    """apply_changes_numpy para pocas celdas: la lógica de apply_changes_loops sobre listas"""
+    cells = rows * board.shape[1] + cols
+    flat = counts.reshape(-1)
+    width = counts.shape[1]
+    delta = 0
+    for units, old, value in zip(units_of_cell[cells].tolist(), board.reshape(-1)[cells].tolist(), values.tolist()):
+        if old == value:
+            continue
+        for unit in units:
+            base = unit * width
+            count = flat[base + old] - 1
+            flat[base + old] = count
+            if count == 0:
+                delta -= 1
+            count = flat[base + value] + 1
+            flat[base + value] = count
+            if count == 1:
+                delta += 1
+    board[rows, cols] = values
+    return delta
+
+def swap_pairs_numpy(values, free, candidates, constrained):
+    """Pares (m, 2) de columnas col1 < col2 intercambiables en una fila, en orden de filas.
+    
+    Ambas celdas deben ser libres y, si constrained, cada valor debe ser
+    candidato legal (bit de candidates) en su nueva columna.
+    """
+    size = len(values)
+    legal = free[:, np.newaxis] & free[np.newaxis, :] & np.triu(np.ones((size, size), dtype=bool), 1)
+    if constrained:
+        # allowed[a, b]: el valor de la columna b es candidato en la columna a
+        allowed = (candidates[:, np.newaxis] >> values[np.newaxis, :]) & 1 == 1
+        legal &= allowed & allowed.T
+    return np.argwhere(legal)
+
+def exchange_columns_numpy(board, row1, row2, free, candidates, draws, rate, constrained):
+    """Columnas en que se intercambian las celdas de row1 y row2: libres en ambas
+    filas, con draws[col] < rate y, si constrained, legales tras el intercambio"""
+    chosen = free[row1] & free[row2] & (draws < rate)
+    if constrained:
+        chosen &= ((candidates[row1] >> board[row2]) & 1 == 1) & ((candidates[row2] >> board[row1]) & 1 == 1)
+    return np.flatnonzero(chosen)
+
+def missing_digits_numpy(row, size):
+    """Dígitos 1..n que no aparecen en la fila, en orden creciente"""
+    present = np.zeros(size + 1, dtype=bool)
+    present[row] = True
+    return np.flatnonzero(~present[1:]) + 1
+
+# Implementación por bucles (compilada con numba si está disponible)
+
+def count_conflicts_loops(boards, units, size):
+    conflicts = np.zeros(boards.shape[0], dtype=np.int64)
+    # Marca por valor de la última unidad en que se vio, para no vaciar un array por unidad
+    seen = np.zeros(256, dtype=np.int64)
+    stamp = 0
+    for b in range(boards.shape[0]):
+        total = 0
+        for u in range(units.shape[0]):
+            stamp += 1
+            distinct = 0
+            for k in range(units.shape[1]):
+                value = boards[b, units[u, k]]
+                if seen[value] != stamp:
+                    seen[value] = stamp
+                    distinct += 1
+            total += size - distinct
+        conflicts[b] = total
+    return conflicts
+
+def unit_counts_loops(board, units, size):
+    counts = np.zeros((units.shape[0], size + 1), dtype=np.int16)
+    for u in range(units.shape[0]):
+        for k in range(units.shape[1]):
+            counts[u, board[units[u, k]]] += 1
+    return counts
+
+def apply_changes_loops(board, counts, units_of_cell, rows, cols, values):
+    size = board.shape[1]
+    delta = 0
+    for i in range(len(rows)):
+        row, col, value = rows[i], cols[i], values[i]
+        old = board[row, col]
+        if old == value:
+            continue
+        for unit in units_of_cell[row * size + col]:
+            counts[unit, old] -= 1
+            if counts[unit, old] == 0:
+                delta -= 1
+            counts[unit, value] += 1
+            if counts[unit, value] == 1:
+                delta += 1
+        board[row, col] = value
+    return delta
+
+def swap_pairs_loops(values, free, candidates, constrained):
+    size = len(values)
+    pairs = np.empty((size * (size - 1) // 2, 2), dtype=np.int64)
+    m = 0
+    for col1 in range(size):
+        if not free[col1]:
+            continue
+        for col2 in range(col1 + 1, size):
+            if not free[col2]:
+                continue
+            if constrained and not ((candidates[col1] >> values[col2]) & 1 and (candidates[col2] >> values[col1]) & 1):
+                continue
+            pairs[m, 0] = col1
+            pairs[m, 1] = col2
+            m += 1
+    return pairs[:m]
+
+def exchange_columns_loops(board, row1, row2, free, candidates, draws, rate, constrained):
+    cols = np.empty(board.shape[1], dtype=np.int64)
+    m = 0
+    for col in range(board.shape[1]):
+        if not (free[row1, col] and free[row2, col] and draws[col] < rate):
+            continue
+        if constrained and not ((candidates[row1, col] >> board[row2, col]) & 1
+                                and (candidates[row2, col] >> board[row1, col]) & 1):
+            continue
+        cols[m] = col
+        m += 1
+    return cols[:m]
+
+def missing_digits_loops(row, size):
+    present = np.zeros(size + 1, dtype=np.bool_)
+    for value in row:
+        present[value] = True
+    digits = np.empty(size, dtype=np.int64)
+    m = 0
+    for digit in range(1, size + 1):
+        if not present[digit]:
+            digits[m] = digit
+            m += 1
+    return digits[:m]
+
+KERNEL_NAMES = ('count_conflicts', 'unit_counts', 'apply_changes', 'swap_pairs', 'exchange_columns',
+                'missing_digits')
+
+def make_backend(name, suffix, compiler=None):
+    functions = {kernel: globals()[f'{kernel}_{suffix}'] for kernel in KERNEL_NAMES}
+    if compiler is not None:
+        functions = {kernel: compiler(function) for kernel, function in functions.items()}
+    return SimpleNamespace(name=name, **functions)
+
+BACKENDS = {'numpy': make_backend('numpy', 'numpy')}
+if numba is not None:
+    # cache=True guarda la compilación en __pycache__ para los siguientes procesos
+    BACKENDS['numba'] = make_backend('numba', 'loops', numba.njit(cache=True))
+
+def resolve_backend(name):
+    """Nombre del backend que corresponde a name ('auto' = numba si está instalado)"""
+    if name == 'auto':
+        return 'numba' if 'numba' in BACKENDS else 'numpy'
+    if name == 'numba' and 'numba' not in BACKENDS:
+        raise ValueError("El backend 'numba' requiere tener numba instalado")
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de núcleos desconocido: {name}")
+    return name
+
+def check_backends(box_sizes=(2, 3, 4), n_boards=50, seed=0, reference='numpy', other=None):
+    """Compara dos backends núcleo a núcleo sobre tableros y cambios aleatorios.
+    
+    other es por defecto el compilado; sin numba se comparan las versiones por
+    bucles sin compilar, que es el mismo código Python que compilaría numba.
+    Devuelve {núcleo: (coincide, segundos de reference, segundos de other)}.
+    """
+    from sudoku import Sudoku
+    first = BACKENDS[reference]
+    second = BACKENDS.get(other or 'numba') or make_backend('loops', 'loops')
+    rng = np.random.default_rng(seed)
+    results = {kernel: [True, 0.0, 0.0] for kernel in KERNEL_NAMES}
+    
+    def compare(kernel, *args):
+        outputs = []
+        for position, backend in ((1, first), (2, second)):
+            copies = [np.copy(arg) if isinstance(arg, np.ndarray) else arg for arg in args]
+            t0 = time.perf_counter()
+            output = getattr(backend, kernel)(*copies)
+            results[kernel][position] += time.perf_counter() - t0
+            # Los núcleos que modifican sus argumentos se comparan también por ellos
+            outputs.append((np.asarray(output), [arg for arg in copies if isinstance(arg, np.ndarray)]))
+        (out1, args1), (out2, args2) = outputs
+        same = np.array_equal(out1, out2) and all(np.array_equal(a, b) for a, b in zip(args1, args2))
+        results[kernel][0] = results[kernel][0] and same
+    
+    for box_size in box_sizes:
+        size = box_size * box_size
+        sudoku = Sudoku(np.zeros((size, size), dtype=np.uint8))
+        # Filas permutadas con pistas al azar: hay conflictos en columnas y cajas
+        boards = rng.permuted(np.tile(np.arange(1, size + 1, dtype=np.uint8), (n_boards, size, 1)), axis=2)
+        fixed = rng.random((size, size)) < 0.3
+        candidates = rng.integers(0, 2 ** (size + 1), (size, size)) & sudoku.all_digits
+        flat = boards.reshape(n_boards, size * size)
+        compare('count_conflicts', flat, sudoku.units, size)
+        for board in boards:
+            compare('unit_counts', board.reshape(-1), sudoku.units, size)
+            counts = unit_counts_numpy(board.reshape(-1), sudoku.units, size)
+            n_changes = int(rng.integers(1, 2 * size))
+            cells = rng.choice(size * size, n_changes, replace=False)
+            compare('apply_changes', board, counts, sudoku.units_of_cell, cells // size, cells % size,
+                    rng.integers(1, size + 1, n_changes))
+            row, row2 = rng.choice(size, 2, replace=False)
+            for constrained in (False, True):
+                compare('swap_pairs', board[row], ~fixed[row], candidates[row], constrained)
+                compare('exchange_columns', board, row, row2, ~fixed, candidates, rng.random(size), 0.3,
+                        constrained)
+            compare('missing_digits', np.where(fixed[row], board[row], 0), size)
+    return {kernel: tuple(values) for kernel, values in results.items()}
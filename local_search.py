@@ -0,0 +1,108 @@
+"""Búsqueda local para el modo memético: tabú sobre intercambios dentro de una fila"""
+import numpy as np
+
+class TabuSearch:
+    """Búsqueda tabú dirigida por conflictos sobre swaps de celdas no fijas de una fila.
+    
+    Como los swaps dentro de una fila no alteran sus dígitos, sólo cambian las
+    cuentas de dos columnas y, como mucho, dos cajas; cada movimiento se evalúa
+    en O(1) con las cuentas de dígitos por unidad.
+    """
+    
+    def __init__(self, sudoku, use_candidates=True, tenure=10, rng=None):
+        self.sudoku = sudoku
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.tenure = tenure
+        n = sudoku.size
+        self.free_cols = [[col for col in range(n) if not sudoku.fixed_positions[row, col]]
+                          for row in range(n)]
+        # Unidad columna y unidad caja de cada celda, como listas para acceso rápido
+        cell_units = sudoku.units_of_cell.reshape(n, n, 3)
+        self.col_unit = cell_units[0, :, 1].tolist()
+        self.box_unit = cell_units[:, :, 2].tolist()
+        self.candidates = sudoku.candidates.tolist() if use_candidates else None
+    
+    def swap_delta(self, counts, row, col1, col2, value1, value2):
+        """Cambio en el número de conflictos al intercambiar (row, col1) y (row, col2)"""
+        delta = 0
+        units = [(self.col_unit[col1], value1, value2), (self.col_unit[col2], value2, value1)]
+        box1, box2 = self.box_unit[row][col1], self.box_unit[row][col2]
+        if box1 != box2:
+            units += [(box1, value1, value2), (box2, value2, value1)]
+        for unit, removed, added in units:
+            unit_counts = counts[unit]
+            # Quitar el último ejemplar de un dígito añade un conflicto
+            if unit_counts[removed] == 1:
+                delta += 1
+            # Añadir un dígito ausente elimina un conflicto
+            if unit_counts[added] == 0:
+                delta -= 1
+        return delta
+    
+    def apply_swap(self, board, counts, row, col1, col2):
+        value1, value2 = board[row][col1], board[row][col2]
+        box1, box2 = self.box_unit[row][col1], self.box_unit[row][col2]
+        for unit, removed, added in ((self.col_unit[col1], value1, value2), (self.col_unit[col2], value2, value1),
+                                     (box1, value1, value2), (box2, value2, value1)):
+            counts[unit][removed] -= 1
+            counts[unit][added] += 1
+        board[row][col1], board[row][col2] = value2, value1
+    
+    def conflicting_rows(self, board, counts):
+        """Filas con alguna celda libre cuya columna o caja tiene un dígito repetido"""
+        rows = []
+        for row in range(len(board)):
+            for col in self.free_cols[row]:
+                value = board[row][col]
+                if counts[self.col_unit[col]][value] > 1 or counts[self.box_unit[row][col]][value] > 1:
+                    rows.append(row)
+                    break
+        return rows
+    
+    def improve(self, board, budget):
+        """Aplica hasta budget movimientos; devuelve (mejor tablero, sus conflictos)"""
+        counts = self.sudoku.unit_counts(board).tolist()
+        board = np.asarray(board).tolist()
+        conflicts = self.sudoku.count_conflicts(np.array(board))
+        best_board, best_conflicts = [list(row) for row in board], conflicts
+        tabu = {}
+        
+        for step in range(budget):
+            if best_conflicts == 0:
+                break
+            rows = self.conflicting_rows(board, counts)
+            if not rows:
+                break
+            row = rows[self.rng.integers(len(rows))]
+            
+            best_move, best_delta = None, None
+            free = self.free_cols[row]
+            for i, col1 in enumerate(free):
+                for col2 in free[i + 1:]:
+                    value1, value2 = board[row][col1], board[row][col2]
+                    # Dos copias del mismo dígito (tras un intercambio entre filas): el swap no cambia nada
+                    if value1 == value2:
+                        continue
+                    if self.candidates is not None and not (
+                            (self.candidates[row][col1] >> value2) & 1 and (self.candidates[row][col2] >> value1) & 1):
+                        continue
+                    delta = self.swap_delta(counts, row, col1, col2, value1, value2)
+                    # Criterio de aspiración: un movimiento tabú se permite si mejora el mejor global
+                    if tabu.get((row, col1, col2), -1) >= step and conflicts + delta >= best_conflicts:
+                        continue
+                    if best_delta is None or delta < best_delta or (delta == best_delta and self.rng.random() < 0.5):
+                        best_move, best_delta = (col1, col2), delta
+            
+            if best_move is None:
+                continue
+            col1, col2 = best_move
+            self.apply_swap(board, counts, row, col1, col2)
+            conflicts += best_delta
+            tabu[(row, col1, col2)] = step + self.tenure
+            
+            if conflicts < best_conflicts:
+                best_board, best_conflicts = [list(r) for r in board], conflicts
+        
+        # Se recuentan los conflictos del tablero devuelto en lugar de fiarse de la suma de deltas
+        best_board = np.array(best_board, dtype=self.sudoku.initial_board.dtype)
+        return best_board, self.sudoku.count_conflicts(best_board)
@@ -0,0 +1,236 @@
+"""Registro de operadores de cruce y mutación y su selección adaptativa.
+
+Los operadores trabajan sobre lotes de tableros (M, n, n) y reciben el
+GeneticAlgorithm para usar su generador y sus utilidades:
+
+    @register_mutation('nombre')
+    def mi_mutacion(ga, boards):
+        ...  # modifica boards en el sitio
+    
+    @register_crossover('nombre')
+    def mi_cruce(ga, parents1, parents2):
+        return children
+
+Todos conservan las celdas fijas y, salvo 'row_exchange', que cada fila sea
+una permutación de sus dígitos.
+"""
+import time
+import numpy as np
+
+CROSSOVERS = {}
+MUTATIONS = {}
+
+def register_crossover(name):
+    def decorator(function):
+        CROSSOVERS[name] = function
+        return function
+    return decorator
+
+def register_mutation(name):
+    def decorator(function):
+        MUTATIONS[name] = function
+        return function
+    return decorator
+
+def cell_conflicts(ga, boards):
+    """Celdas libres cuyo valor se repite en su columna o su caja: (M, n, n) booleanos"""
+    sudoku = ga.sudoku
+    m, size = len(boards), sudoku.size
+    flat = boards.reshape(m, size * size)
+    repeated = np.zeros(flat.shape, dtype=bool)
+    # Columna y caja de cada celda (las filas son permutaciones y no se repiten); módulo n,
+    # cada tipo de unidad se numera 0..n-1
+    for unit_of_cell in sudoku.units_of_cell[:, 1:].T % size:
+        # Cuenta de cada valor en cada columna (o caja) de cada tablero, leída de vuelta por celda
+        index = (np.arange(m)[:, np.newaxis] * size + unit_of_cell) * (size + 1) + flat
+        counts = np.bincount(index.ravel(), minlength=m * size * (size + 1))
+        repeated |= counts[index] > 1
+    return repeated.reshape(boards.shape) & ~sudoku.fixed_positions
+
+# Cruces
+
+@register_crossover('rows')
+def rows_crossover(ga, parents1, parents2):
+    """Cada hijo toma de 2 a n/2 + 1 filas al azar del segundo padre"""
+    return ga.crossover_array(parents1, parents2)
+
+@register_crossover('bands')
+def bands_crossover(ga, parents1, parents2):
+    """Bandas completas del segundo padre: las cajas de una banda no se mezclan"""
+    box_size = ga.sudoku.box_size
+    n_bands = ga.rng.integers(1, box_size, len(parents1))
+    ranks = np.argsort(np.argsort(ga.rng.random((len(parents1), box_size)), axis=1), axis=1)
+    bands = np.repeat(ranks < n_bands[:, np.newaxis], box_size, axis=1)
+    return np.where(bands[:, :, np.newaxis], parents2, parents1)
+
+@register_crossover('column_aware')
+def column_aware_crossover(ga, parents1, parents2):
+    """Cada fila se toma del padre en que provoca menos repeticiones en columnas y cajas"""
+    conflicts1 = cell_conflicts(ga, parents1).sum(axis=2)
+    conflicts2 = cell_conflicts(ga, parents2).sum(axis=2)
+    # Los empates se deciden al azar para no favorecer siempre al primer padre
+    ties = ga.rng.random(conflicts1.shape) < 0.5
+    take2 = (conflicts2 < conflicts1) | ((conflicts2 == conflicts1) & ties)
+    return np.where(take2[:, :, np.newaxis], parents2, parents1)
+
+# Mutaciones
+
+@register_mutation('swap')
+def swap_mutation(ga, boards):
+    """Intercambio de dos celdas libres de una fila aleatoria"""
+    ga.mutate_rows_at(boards, np.arange(len(boards)), ga.swap_free_cells)
+
+@register_mutation('row_exchange')
+def row_exchange_mutation(ga, boards):
+    """Intercambio de celdas libres entre dos filas en la misma columna"""
+    ga.exchange_between_rows(boards, np.arange(len(boards)))
+
+@register_mutation('shuffle')
+def shuffle_mutation(ga, boards):
+    """Reordenación completa de una fila aleatoria"""
+    ga.mutate_rows_at(boards, np.arange(len(boards)), ga.shuffle_free_cells)
+
+@register_mutation('conflict_swap')
+def conflict_swap_mutation(ga, boards):
+    """Intercambio en una fila con conflictos en que al menos una celda está en conflicto"""
+    m, size = len(boards), ga.sudoku.size
+    idx = np.arange(m)
+    conflicts = cell_conflicts(ga, boards)
+    # Una fila al azar entre las que tienen conflictos (cualquiera si el tablero no tiene)
+    has_conflict = conflicts.any(axis=2)
+    rows = np.argmax(ga.rng.random((m, size)) + has_conflict, axis=1)
+    values = boards[idx, rows]
+    legal = ga.legal_swaps(values, rows)
+    row_conflicts = conflicts[idx, rows]
+    legal &= row_conflicts[:, :, np.newaxis] | row_conflicts[:, np.newaxis, :]
+    legal = legal.reshape(m, size * size)
+    pair = np.argmin(np.where(legal, ga.rng.random(legal.shape), np.inf), axis=1)
+    can_swap = legal[idx, pair]
+    idx, rows, pair = idx[can_swap], rows[can_swap], pair[can_swap]
+    col1, col2 = pair // size, pair % size
+    boards[idx, rows, col1], boards[idx, rows, col2] = boards[idx, rows, col2], boards[idx, rows, col1]
+
+@register_mutation('inversion')
+def inversion_mutation(ga, boards):
+    """Invierte el orden de un tramo de las celdas libres de una fila aleatoria.
+    
+    Con propagación de restricciones sólo se aplica si todos los valores movidos
+    son candidatos legales en su nueva celda.
+    """
+    m, size = len(boards), ga.sudoku.size
+    idx = np.arange(m)[:, np.newaxis]
+    rows = ga.rng.integers(0, size, m)
+    fixed = ga.sudoku.fixed_positions[rows]
+    # Columnas libres en su orden natural, seguidas de las fijas
+    order = np.argsort(np.where(fixed, np.inf, np.arange(size)), axis=1, kind='stable')
+    n_free = (~fixed).sum(axis=1)
+    start, end = np.sort(ga.rng.integers(0, np.maximum(n_free, 1)[:, np.newaxis], (m, 2)), axis=1).T
+    positions = np.arange(size)
+    inside = (positions >= start[:, np.newaxis]) & (positions <= end[:, np.newaxis])
+    source = np.where(inside, start[:, np.newaxis] + end[:, np.newaxis] - positions, positions)
+    row_idx = rows[:, np.newaxis]
+    current = boards[idx, row_idx, order]
+    inverted = np.take_along_axis(current, source, axis=1)
+    if ga.config.CONSTRAINT_PROPAGATION:
+        legal = ga.sudoku.allowed(row_idx, order, inverted).all(axis=1)
+        inverted = np.where(legal[:, np.newaxis], inverted, current)
+    boards[idx, row_idx, order] = inverted
+
+class AdaptivePursuit:
+    """Selección adaptativa de operadores por persecución (adaptive pursuit).
+    
+    Cada operador tiene una calidad estimada (media exponencial de su
+    recompensa con tasa alpha) y una probabilidad que se mueve con tasa beta
+    hacia p_max para el de mayor calidad y hacia p_min para los demás. La
+    recompensa de una generación es la mejora media que produjo el operador.
+    Lleva además la estadística de uso, éxitos, mejora y tiempo por operador.
+    """
+    
+    # Arrays por operador que forman su estado (se guardan en los checkpoints)
+    STATE = ('probabilities', 'quality', 'uses', 'successes', 'gain', 'time')
+    
+    def __init__(self, operators, names, rng, p_min=0.05, alpha=0.3, beta=0.1):
+        unknown = [name for name in names if name not in operators]
+        if unknown:
+            raise ValueError(f"Operadores desconocidos: {', '.join(unknown)}")
+        self.names = list(names)
+        self.functions = [operators[name] for name in names]
+        self.rng = rng
+        k = len(names)
+        self.p_min = min(p_min, 1.0 / k)
+        self.p_max = 1.0 - (k - 1) * self.p_min
+        self.alpha = alpha
+        self.beta = beta
+        self.probabilities = np.full(k, 1.0 / k)
+        self.quality = np.zeros(k)
+        self.uses = np.zeros(k, dtype=np.int64)
+        self.successes = np.zeros(k, dtype=np.int64)
+        self.gain = np.zeros(k)
+        self.time = np.zeros(k)
+    
+    def choose(self, n):
+        """Operador (índice) para cada uno de n hijos según las probabilidades actuales"""
+        return self.rng.choice(len(self.names), n, p=self.probabilities)
+    
+    def apply(self, ga, choices, *batches):
+        """Aplica a cada grupo de filas de batches el operador elegido para él.
+        
+        Hace una sola llamada por operador y devuelve [(índices, resultado)];
+        el resultado de una mutación es su primer lote, modificado en el sitio.
+        """
+        results = []
+        for k, function in enumerate(self.functions):
+            members = np.flatnonzero(choices == k)
+            if not len(members):
+                continue
+            args = [batch[members] for batch in batches]
+            t0 = time.perf_counter()
+            output = function(ga, *args)
+            self.time[k] += time.perf_counter() - t0
+            results.append((members, args[0] if output is None else output))
+        return results
+    
+    def update(self, choices, gains):
+        """Registra la mejora de fitness de cada hijo y adapta las probabilidades"""
+        improved = np.maximum(gains, 0)
+        self.uses += np.bincount(choices, minlength=len(self.names))
+        self.successes += np.bincount(choices, weights=gains > 0, minlength=len(self.names)).astype(np.int64)
+        self.gain += np.bincount(choices, weights=improved, minlength=len(self.names))
+        for k in np.unique(choices):
+            reward = improved[choices == k].mean()
+            self.quality[k] += self.alpha * (reward - self.quality[k])
+        best = int(np.argmax(self.quality))
+        target = np.full(len(self.names), self.p_min)
+        target[best] = self.p_max
+        self.probabilities += self.beta * (target - self.probabilities)
+        self.probabilities /= self.probabilities.sum()
+    
+    def state(self):
+        """Copia de los arrays de STATE, por nombre"""
+        return {field: getattr(self, field).copy() for field in self.STATE}
+    
+    def load_state(self, state):
+        """Restaura los arrays guardados con state()"""
+        for field in self.STATE:
+            current = getattr(self, field)
+            if state[field].shape != current.shape:
+                raise ValueError(f"El estado tiene {len(state[field])} operadores y el control {len(current)}")
+            setattr(self, field, state[field].astype(current.dtype))
+    
+    def stats(self):
+        """Estadística por operador: probabilidad actual, usos, éxitos, mejora y tiempo"""
+        return {name: {'probability': float(self.probabilities[k]),
+                       'uses': int(self.uses[k]),
+                       'success_rate': float(self.successes[k] / self.uses[k]) if self.uses[k] else 0.0,
+                       'gain': float(self.gain[k]),
+                       'gain_per_second': float(self.gain[k] / self.time[k]) if self.time[k] else 0.0,
+                       'time': float(self.time[k])}
+                for k, name in enumerate(self.names)}
+    
+    def report(self, title):
+        """Tabla de texto con la estadística de stats()"""
+        lines = [f"{title:<14} {'Prob.':>6} {'Usos':>8} {'Éxito':>7} {'Mejora':>8} {'Tiempo (s)':>11}"]
+        for name, row in self.stats().items():
+            lines.append(f"{name:<14} {row['probability']:>6.2f} {row['uses']:>8} {row['success_rate']:>7.1%} "
+                         f"{row['gain']:>8.0f} {row['time']:>11.3f}")
+        return '\n'.join(lines)
@@ -0,0 +1,124 @@
+"""Generación de descendientes del modo array en paralelo sobre memoria compartida.
+
+La población vive en dos bloques de multiprocessing.shared_memory con sitio
+para dos generaciones (tableros uint8 planos y fitness int64): uno hace de
+padres y el otro recibe los hijos, y se alternan en cada generación. Un pool
+persistente de procesos rellena trozos disjuntos del buffer de hijos
+(selección por torneo, cruce, mutación y evaluación); cada tarea sólo lleva
+índices, la tasa de mutación y una semilla, así que ningún tablero pasa por
+pickle. El coordinador (GeneticAlgorithm.evolve_parallel) sólo copia la élite
+o hace el reemplazo por torneo restringido.
+
+Los trozos tienen tamaño fijo (PARALLEL_CHUNK) y cada uno su propia semilla
+sacada del generador del AG: con la misma semilla se obtiene la misma
+ejecución con cualquier número de procesos.
+"""
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from selection import tournament
+
+_worker_ga = None
+_worker_population = None
+
+class SharedPopulation:
+    """Dos generaciones de la población (N, n, n) en memoria compartida.
+    
+    boards[k] y fitness[k], con k = 0, 1, son vistas NumPy sobre los bloques.
+    Quien los crea es su dueño y los libera (unlink) al cerrar; los procesos
+    trabajadores se conectan por nombre.
+    """
+    
+    def __init__(self, population_size, size, names=None):
+        shapes = ((2, population_size, size, size), (2, population_size))
+        dtypes = (np.uint8, np.int64)
+        self.owner = names is None
+        if self.owner:
+            self.blocks = [SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(dtype).itemsize)
+                           for shape, dtype in zip(shapes, dtypes)]
+        else:
+            # Los trabajadores del pool comparten el rastreador de recursos del dueño,
+            # que es quien borra los bloques si el proceso principal muere sin cerrarlos
+            self.blocks = [SharedMemory(name=name) for name in names]
+        self.boards = np.ndarray(shapes[0], dtype=dtypes[0], buffer=self.blocks[0].buf)
+        self.fitness = np.ndarray(shapes[1], dtype=dtypes[1], buffer=self.blocks[1].buf)
+    
+    @property
+    def names(self):
+        return tuple(block.name for block in self.blocks)
+    
+    def close(self):
+        """Suelta las vistas y cierra los bloques; el dueño además los borra.
+        
+        No debe quedar ninguna otra vista viva sobre los buffers.
+        """
+        self.boards = self.fitness = None
+        for block in self.blocks:
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = []
+
+def init_worker(sudoku, config, names):
+    """Inicializa cada proceso del pool: conexión a los buffers y un AG para sus operadores"""
+    global _worker_ga, _worker_population
+    # Importación diferida: genetic_algorithm importa este módulo
+    from genetic_algorithm import GeneticAlgorithm
+    _worker_population = SharedPopulation(config.POPULATION_SIZE, sudoku.size, names)
+    _worker_ga = GeneticAlgorithm(sudoku, config)
+
+def breed_chunk(task):
+    """Genera los hijos [start, stop) a partir de los padres de parents_buffer y los escribe en el otro buffer"""
+    parents_buffer, start, stop, seed, mutation_rate = task
+    ga, population = _worker_ga, _worker_population
+    ga.rng = np.random.default_rng(seed)
+    parents, fitness = population.boards[parents_buffer], population.fitness[parents_buffer]
+    n = stop - start
+    parents1 = tournament(fitness, n, ga.config.TOURNAMENT_SIZE, ga.rng)
+    parents2 = tournament(fitness, n, ga.config.TOURNAMENT_SIZE, ga.rng)
+    children = ga.mutate_array(ga.crossover_array(parents[parents1], parents[parents2]), mutation_rate)
+    next_buffer = 1 - parents_buffer
+    population.boards[next_buffer, start:stop] = children
+    population.fitness[next_buffer, start:stop] = ga.sudoku.fitness_batch(children)
+
+class ParallelBreeder:
+    """Pool persistente de procesos que generan los hijos del modo array en memoria compartida"""
+    
+    def __init__(self, sudoku, config, workers):
+        self.population = SharedPopulation(config.POPULATION_SIZE, sudoku.size)
+        self.chunk = config.PARALLEL_CHUNK
+        # Vistas fijas de cada buffer: el coordinador reconoce así si su población sigue en ellos
+        self.views = [(self.population.boards[k], self.population.fitness[k]) for k in range(2)]
+        # Buffer que contiene ahora la población (los padres de la próxima generación)
+        self.current = 0
+        self.pool = multiprocessing.Pool(workers, initializer=init_worker,
+                                         initargs=(sudoku, config, self.population.names))
+    
+    def parents(self):
+        """Vistas (tableros, fitness) del buffer de la población actual"""
+        return self.views[self.current]
+    
+    def breed(self, first, mutation_rate, rng):
+        """Rellena las posiciones [first, N) del otro buffer con hijos de la población actual.
+        
+        Devuelve las vistas (tableros, fitness) de ese buffer; las posiciones
+        [0, first) quedan para la élite que copie el coordinador.
+        """
+        size = len(self.population.fitness[self.current])
+        bounds = list(range(first, size, self.chunk)) + [size]
+        seeds = rng.integers(0, 2 ** 63, len(bounds) - 1)
+        tasks = [(self.current, start, stop, int(seed), mutation_rate)
+                 for start, stop, seed in zip(bounds[:-1], bounds[1:], seeds)]
+        self.pool.map(breed_chunk, tasks)
+        return self.views[1 - self.current]
+    
+    def swap(self):
+        """La generación recién creada pasa a ser la población actual"""
+        self.current = 1 - self.current
+        return self.parents()
+    
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self.views = None
+        self.population.close()
@@ -0,0 +1,73 @@
+from collections import deque
+import time
+
+class PhaseProfiler:
+    """Tiempos y número de llamadas por fase del algoritmo genético.
+    
+    Uso en el código instrumentado:
+    
+        t0 = profiler.start()
+        ...
+        profiler.stop('crossover', t0)
+    
+    Las fases anidadas (la evaluación dentro de un operador) se abren y cierran
+    con nested=True y su tiempo se descuenta de la fase que las contiene, de
+    modo que los totales de cada fase son exclusivos.
+    
+    El desglose por generación se guarda para una de cada stride generaciones
+    y sólo para las max_generations más recientes.
+    """
+    
+    def __init__(self, stride=1, max_generations=1000):
+        self.totals = {}
+        self.calls = {}
+        self.stride = stride
+        self.generations = deque(maxlen=max_generations)
+        self._generation_totals = {}
+        self._generation_calls = {}
+        self._nested_time = 0.0
+    
+    def start(self, nested=False):
+        if not nested:
+            # El tiempo anidado registrado fuera de toda fase no se descuenta de esta
+            self._nested_time = 0.0
+        return time.perf_counter()
+    
+    def stop(self, phase, t0, nested=False):
+        elapsed = time.perf_counter() - t0
+        if nested:
+            self._nested_time += elapsed
+        else:
+            elapsed -= self._nested_time
+            self._nested_time = 0.0
+        self.totals[phase] = self.totals.get(phase, 0.0) + elapsed
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self._generation_totals[phase] = self._generation_totals.get(phase, 0.0) + elapsed
+        self._generation_calls[phase] = self._generation_calls.get(phase, 0) + 1
+    
+    def end_generation(self, generation):
+        """Cierra los contadores de la generación actual"""
+        if generation % self.stride == 0:
+            self.generations.append({
+                'generation': generation,
+                'times': self._generation_totals,
+                'calls': self._generation_calls
+            })
+        self._generation_totals = {}
+        self._generation_calls = {}
+    
+    def summary(self):
+        """Totales acumulados por fase: segundos, llamadas y media por llamada"""
+        return {phase: {'time': total,
+                        'calls': self.calls[phase],
+                        'mean': total / self.calls[phase]}
+                for phase, total in self.totals.items()}
+    
+    def report(self):
+        """Tabla de texto con las fases ordenadas por tiempo total"""
+        grand_total = sum(self.totals.values()) or 1.0
+        lines = [f"{'Fase':<14} {'Tiempo (s)':>11} {'%':>6} {'Llamadas':>10} {'Media (us)':>11}"]
+        for phase, stats in sorted(self.summary().items(), key=lambda item: -item[1]['time']):
+            lines.append(f"{phase:<14} {stats['time']:>11.3f} {100 * stats['time'] / grand_total:>6.1f} "
+                         f"{stats['calls']:>10} {stats['mean'] * 1e6:>11.1f}")
+        return '\n'.join(lines)
@@ -0,0 +1,88 @@
+"""Corpus de sudokus de ejemplo y de benchmark, etiquetados por dificultad"""
+import numpy as np
+from sudoku import parse_board
+
+# Los tres tableros de ejemplo de la interfaz gráfica
+EXAMPLES = {
+    'facil': [
+        [5,3,0,0,7,0,0,0,0],
+        [6,0,0,1,9,5,0,0,0],
+        [0,9,8,0,0,0,0,6,0],
+        [8,0,0,0,6,0,0,0,3],
+        [4,0,0,8,0,3,0,0,1],
+        [7,0,0,0,2,0,0,0,6],
+        [0,6,0,0,0,0,2,8,0],
+        [0,0,0,4,1,9,0,0,5],
+        [0,0,0,0,8,0,0,7,9]
+    ],
+    'medio': [
+        [0,0,0,6,0,0,4,0,0],
+        [7,0,0,0,0,3,6,0,0],
+        [0,0,0,0,9,1,0,8,0],
+        [0,0,0,0,0,0,0,0,0],
+        [0,5,0,1,8,0,0,0,3],
+        [0,0,0,3,0,6,0,4,5],
+        [0,4,0,2,0,0,0,6,0],
+        [9,0,3,0,0,0,0,0,0],
+        [0,2,0,0,0,0,1,0,0]
+    ],
+    'dificil': [
+        [0,0,0,0,0,0,0,1,2],
+        [0,0,0,0,3,5,0,0,0],
+        [0,0,0,6,0,0,0,7,0],
+        [7,0,0,0,0,0,3,0,0],
+        [0,0,0,4,0,0,8,0,0],
+        [1,0,0,0,0,0,0,0,0],
+        [0,0,0,1,2,0,0,0,0],
+        [0,8,0,0,0,0,0,4,0],
+        [0,5,0,0,0,0,6,0,0]
+    ]
+}
+
+# (nombre, dificultad, puzzle en una línea)
+# ejemplo_medio, inkala_2012 y los cuatro últimos no se resuelven sólo con propagación (singles
+# desnudos y ocultos): con ellos el benchmark mide el AG también con CONSTRAINT_PROPAGATION
+CORPUS = [
+    ('ejemplo_facil', 'facil', EXAMPLES['facil']),
+    ('ejemplo_medio', 'medio', EXAMPLES['medio']),
+    ('ejemplo_dificil', 'dificil', EXAMPLES['dificil']),
+    ('euler_01', 'facil', '003020600900305001001806400008102900700000008006708200002609500800203009005010300'),
+    ('euler_02', 'facil', '200080300060070084030500209000105408000000000402706000301007040720040060004010003'),
+    ('medio_01', 'medio', '000000907000420180000705026100904000050000040000507009920108000034059000507000000'),
+    ('medio_02', 'medio', '030050040008010500460000012070502080000603000040109030250000098001020600080060020'),
+    ('inkala_2012', 'dificil', '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..'),
+    ('dificil_01', 'dificil', '100920000524010000000000070050008102000000000402700090060000000000030945000071006'),
+    ('dificil_02', 'dificil', '043080250600000000000001094900004070000608000010200003820500000000000005034090710'),
+    ('ai_escargot', 'dificil', '1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..'),
+    ('easter_monster', 'dificil', '1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1'),
+]
+
+def corpus(difficulties=None):
+    """Puzzles del corpus como (nombre, dificultad, tablero 9x9), opcionalmente filtrados"""
+    for name, difficulty, puzzle in CORPUS:
+        if difficulties and difficulty not in difficulties:
+            continue
+        board = parse_board(puzzle) if isinstance(puzzle, str) else puzzle
+        yield name, difficulty, board
+
+def generate_puzzle(box_size=3, holes=None, rng=None):
+    """Sudoku aleatorio de lado n = box_size² con holes celdas vacías (por defecto la mitad).
+    
+    Parte de la solución canónica por bandas y la baraja con permutaciones que
+    preservan la validez (filas dentro de bandas, bandas, columnas y dígitos),
+    así que siempre tiene al menos una solución, aunque no necesariamente única.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n = box_size * box_size
+    holes = n * n // 2 if holes is None else holes
+    
+    def shuffled_groups():
+        # Orden aleatorio de grupos y de los elementos dentro de cada grupo
+        return [g * box_size + i for g in rng.permutation(box_size) for i in rng.permutation(box_size)]
+    
+    rows, cols = shuffled_groups(), shuffled_groups()
+    digits = rng.permutation(n) + 1
+    pattern = lambda r, c: (box_size * (r % box_size) + r // box_size + c) % n
+    board = np.array([[digits[pattern(r, c)] for c in cols] for r in rows])
+    board.reshape(-1)[rng.choice(n * n, holes, replace=False)] = 0
+    return board
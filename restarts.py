@@ -0,0 +1,117 @@
+"""Reinicios programados: secuencia de intentos independientes con presupuesto creciente"""
+import time
+import numpy as np
+from config import Config
+from genetic_algorithm import GeneticAlgorithm
+
+def luby(i):
+    """Término i (desde 1) de la secuencia de Luby: 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if (1 << k) - 1 == i:
+        return 1 << (k - 1)
+    # i cae dentro de la repetición de la secuencia anterior
+    return luby(i - (1 << (k - 1)) + 1)
+
+def restart_budgets(schedule, base, factor=2.0):
+    """Presupuestos en generaciones de los sucesivos intentos (generador infinito)"""
+    attempt = 1
+    while True:
+        if schedule == 'luby':
+            yield base * luby(attempt)
+        elif schedule == 'geometric':
+            yield int(base * factor ** (attempt - 1))
+        else:
+            raise ValueError(f"Programa de reinicios desconocido: {schedule}")
+        attempt += 1
+
+class RestartScheduler:
+    """Ejecuta GeneticAlgorithm en intentos independientes con presupuesto Luby o geométrico.
+    
+    Config.GENERATIONS es el presupuesto total entre todos los intentos. Entre
+    intentos se pueden variar el tamaño de población y la tasa de mutación
+    (RESTART_VARY_PARAMS) y conservar los mejores tableros (RESTART_CARRY_ELITES).
+    """
+    
+    def __init__(self, sudoku, config=Config(), callback=None, rng=None):
+        self.sudoku = sudoku
+        self.config = config
+        self.callback = callback
+        self.rng = rng if rng is not None else np.random.default_rng(config.SEED)
+        self.best_individual = None
+        self.generation = 0
+        self.elapsed = 0.0
+        self.attempts = []
+        self.ga = None
+        self.stopped = False
+    
+    def attempt_config(self, budget):
+        """Configuración de un intento, con los parámetros variados si se pide"""
+        config = Config()
+        config.__dict__.update(self.config.__dict__)
+        config.GENERATIONS = budget
+        config.VERBOSE = False
+        config.CHECKPOINT_EVERY = 0
+        if self.config.RESTART_VARY_PARAMS and self.attempts:
+            population = int(self.config.POPULATION_SIZE * self.rng.choice([0.5, 1.0, 2.0]))
+            config.POPULATION_SIZE = max(population, 2 * self.config.ELITE_SIZE)
+            config.MUTATION_RATE = float(np.clip(self.config.MUTATION_RATE * self.rng.uniform(0.5, 1.5), 0.05, 1.0))
+        return config
+    
+    def forward_callback(self, ga):
+        """Reenvía el progreso del intento en curso; False detiene todos los intentos"""
+        self.ga = ga
+        if self.callback and not self.callback(ga):
+            self.stopped = True
+            return False
+        return True
+    
+    def solve(self):
+        start = time.perf_counter()
+        budgets = restart_budgets(self.config.RESTART_SCHEDULE, self.config.RESTART_BASE,
+                                  self.config.RESTART_FACTOR)
+        elites = None
+        
+        try:
+            while self.generation < self.config.GENERATIONS and not self.stopped:
+                budget = min(next(budgets), self.config.GENERATIONS - self.generation)
+                config = self.attempt_config(budget)
+                # Cada intento tiene su propio flujo aleatorio derivado del del planificador
+                ga = GeneticAlgorithm(self.sudoku, config, callback=self.forward_callback,
+                                      rng=self.rng.spawn(1)[0])
+                self.ga = ga
+                if elites is not None:
+                    # Con RESTART_VARY_PARAMS el intento puede ser más pequeño que el que las produjo
+                    elites = elites[:config.POPULATION_SIZE // 2]
+                board = ga.solve(seed_boards=elites)
+                self.generation += ga.generation
+                
+                best = ga.best_individual
+                if self.best_individual is None or best.fitness > self.best_individual.fitness:
+                    self.best_individual = best
+                self.attempts.append({
+                    'attempt': len(self.attempts) + 1,
+                    'budget': budget,
+                    'generations': ga.generation,
+                    'population': config.POPULATION_SIZE,
+                    'mutation_rate': config.MUTATION_RATE,
+                    'fitness': best.fitness,
+                    'elapsed': ga.elapsed
+                })
+                if self.config.VERBOSE:
+                    print(f"Intento {len(self.attempts)}: {ga.generation}/{budget} generaciones, "
+                          f"fitness = {best.fitness} (población {config.POPULATION_SIZE}, "
+                          f"mutación {config.MUTATION_RATE:.2f})")
+                
+                if self.sudoku.is_solved(board):
+                    break
+                if self.config.RESTART_CARRY_ELITES:
+                    elites = ga.emigrants(min(self.config.RESTART_CARRY_ELITES, config.POPULATION_SIZE))
+        finally:
+            self.elapsed += time.perf_counter() - start
+        
+        if self.config.VERBOSE:
+            status = "resuelto" if self.sudoku.is_solved(self.best_individual.board) else "sin solución completa"
+            print(f"\n{status.capitalize()} tras {len(self.attempts)} intentos y {self.generation} generaciones")
+        return self.best_individual.board
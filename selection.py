@@ -0,0 +1,28 @@
+"""Selección sobre vectores de fitness, sin ordenar la población completa"""
+import numpy as np
+
+def top_k(fitness, k):
+    """Índices de los k mayores valores de fitness, de mejor a peor.
+    
+    Usa selección parcial (argpartition, O(N)) y sólo ordena los k elegidos.
+    """
+    fitness = np.asarray(fitness)
+    k = min(k, len(fitness))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(fitness):
+        candidates = np.argpartition(-fitness, k - 1)[:k]
+    else:
+        candidates = np.arange(len(fitness))
+    return candidates[np.argsort(-fitness[candidates], kind='stable')]
+
+def bottom_k(fitness, k):
+    """Índices de los k peores valores de fitness, de peor a mejor"""
+    return top_k(-np.asarray(fitness), k)
+
+def tournament(fitness, n, size, rng):
+    """n torneos de size contendientes en paralelo; devuelve los índices ganadores"""
+    fitness = np.asarray(fitness)
+    contenders = rng.integers(0, len(fitness), (n, size))
+    winners = np.argmax(fitness[contenders], axis=1)
+    return contenders[np.arange(n), winners]
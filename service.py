@@ -0,0 +1,285 @@
+"""Servicio local de resolución sobre TCP o socket Unix con JSON por líneas.
+
+Cada línea que envía el cliente es un objeto JSON con un campo "op":
+
+    {"op": "solve", "id": "a1", "puzzle": "0030206009...", "timeout": 30,
+     "progress": true, "config": {"POPULATION_SIZE": 500, "SEED": 1}}
+    {"op": "cancel", "id": "a1"}
+    {"op": "status"}
+
+y el servidor responde con eventos, también uno por línea: accepted,
+rejected (cola llena o petición inválida), started, progress, result,
+cancelled, timeout y error. Todos llevan el "id" del trabajo (si el cliente no
+lo da se asigna uno). Los trabajos se ejecutan en un pool de procesos; cuando
+la cola está llena las peticiones nuevas se rechazan en lugar de acumularse.
+
+    python service.py --port 8765 --workers 4
+    python service.py --unix /tmp/sudoku.sock
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import Config
+from solve import run_solver
+from solution_cache import SolutionCache
+from sudoku import Sudoku, parse_board
+
+# Parámetros de Config que una petición puede cambiar
+CONFIG_OVERRIDES = ('POPULATION_SIZE', 'GENERATIONS', 'MUTATION_RATE', 'ELITE_SIZE', 'TOURNAMENT_SIZE',
+                    'SEED', 'CONSTRAINT_PROPAGATION', 'ARRAY_POPULATION', 'MEMETIC', 'RESTARTS', 'SOLVER',
+                    'HYBRID_MODE')
+
+def run_job(job_id, puzzle, config, deadline, cancel_event, progress):
+    """Resuelve un puzzle en un proceso del pool.
+    
+    El callback del AG comprueba la cancelación y el plazo y publica el
+    progreso en la cola compartida (si se pidió). Con SOLUTION_CACHE_PATH se
+    consulta antes la caché de soluciones. Devuelve el evento final.
+    """
+    sudoku = Sudoku(parse_board(puzzle))
+    outcome = 'result'
+    
+    def callback(ga):
+        nonlocal outcome
+        if cancel_event.is_set():
+            outcome = 'cancelled'
+            return False
+        if deadline is not None and time.time() > deadline:
+            outcome = 'timeout'
+            return False
+        if progress is not None:
+            fitness = int(ga.best_individual.fitness)
+            progress.put({'event': 'progress', 'id': job_id, 'generation': ga.generation,
+                          'fitness': fitness, 'conflicts': sudoku.max_fitness - fitness})
+        return True
+    
+    cache = SolutionCache(config.SOLUTION_CACHE_PATH) if config.SOLUTION_CACHE_PATH else None
+    try:
+        result = run_solver(sudoku, config, cache, callback=callback)
+    finally:
+        if cache is not None:
+            cache.close()
+    return {'event': outcome, 'id': job_id, **result}
+
+class Job:
+    def __init__(self, job_id, puzzle, config, timeout, progress, connection, cancel_event):
+        self.id = job_id
+        self.puzzle = puzzle
+        self.config = config
+        self.timeout = timeout
+        self.progress = progress
+        self.connection = connection
+        self.cancel_event = cancel_event
+        self.started = False
+
+class Connection:
+    """Extremo de un cliente; serializa las escrituras de las distintas tareas"""
+    
+    def __init__(self, writer):
+        self.writer = writer
+        self.lock = asyncio.Lock()
+        self.closed = False
+    
+    async def send(self, message):
+        if self.closed:
+            return
+        async with self.lock:
+            try:
+                self.writer.write((json.dumps(message) + '\n').encode())
+                await self.writer.drain()
+            except ConnectionError:
+                self.closed = True
+
+class SolveService:
+    """Cola acotada de trabajos atendida por workers tareas que usan un pool de procesos"""
+    
+    def __init__(self, config=Config(), workers=None, queue_size=None):
+        self.config = config
+        self.workers = workers or multiprocessing.cpu_count()
+        self.queue = asyncio.Queue(queue_size or config.SERVICE_QUEUE_SIZE)
+        self.jobs = {}
+        self.ids = itertools.count(1)
+        self.pool = None
+        self.manager = None
+        self.progress = None
+        # Tareas de los clientes conectados; se esperan al cerrar, antes que el Manager
+        self.clients = set()
+    
+    def job_config(self, overrides):
+        """Config de un trabajo: la del servicio más los cambios permitidos de la petición"""
+        config = Config()
+        config.__dict__.update(self.config.__dict__)
+        for name, value in (overrides or {}).items():
+            if name not in CONFIG_OVERRIDES:
+                raise ValueError(f"Parámetro no permitido: {name}")
+            setattr(config, name, value)
+        config.VERBOSE = False
+        config.REALTIME_VISUALIZATION = False
+        config.CHECKPOINT_EVERY = 0
+        # El callback (cancelación, plazo y progreso) se evalúa cada SERVICE_PROGRESS_EVERY generaciones
+        config.SHOW_EVERY = self.config.SERVICE_PROGRESS_EVERY
+        return config
+    
+    async def handle_client(self, reader, writer):
+        connection = Connection(writer)
+        self.clients.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    await self.handle_message(message, connection)
+                except (ValueError, TypeError, KeyError, AttributeError) as e:
+                    await connection.send({'event': 'error', 'message': str(e)})
+        except asyncio.CancelledError:
+            # Cierre del servicio: para el cliente equivale a una desconexión
+            pass
+        finally:
+            connection.closed = True
+            # Los trabajos de un cliente desconectado no tienen a quién informar
+            for job in list(self.jobs.values()):
+                if job.connection is connection:
+                    job.cancel_event.set()
+            writer.close()
+            self.clients.discard(asyncio.current_task())
+    
+    async def handle_message(self, message, connection):
+        op = message.get('op')
+        if op == 'solve':
+            job_id = str(message.get('id') or next(self.ids))
+            if job_id in self.jobs:
+                await connection.send({'event': 'rejected', 'id': job_id, 'reason': 'duplicate_id'})
+                return
+            timeout = message.get('timeout', self.config.SERVICE_TIMEOUT)
+            try:
+                parse_board(message['puzzle'])
+                config = self.job_config(message.get('config'))
+                if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float))
+                                            or not timeout > 0):
+                    raise ValueError(f"El plazo debe ser un número de segundos positivo, no {timeout!r}")
+            except ValueError as e:
+                await connection.send({'event': 'rejected', 'id': job_id, 'reason': 'invalid', 'message': str(e)})
+                return
+            job = Job(job_id, message['puzzle'], config, timeout, bool(message.get('progress')),
+                      connection, self.manager.Event())
+            try:
+                self.queue.put_nowait(job)
+            except asyncio.QueueFull:
+                await connection.send({'event': 'rejected', 'id': job_id, 'reason': 'queue_full'})
+                return
+            self.jobs[job_id] = job
+            await connection.send({'event': 'accepted', 'id': job_id, 'queued': self.queue.qsize()})
+        elif op == 'cancel':
+            job = self.jobs.get(str(message.get('id')))
+            if job is None:
+                await connection.send({'event': 'error', 'id': message.get('id'), 'message': "Trabajo desconocido"})
+                return
+            job.cancel_event.set()
+            # Un trabajo aún en cola se descarta al sacarlo; uno en marcha se detiene en su próximo callback
+            if not job.started:
+                await connection.send({'event': 'cancelled', 'id': job.id})
+        elif op == 'status':
+            running = sum(job.started for job in self.jobs.values())
+            await connection.send({'event': 'status', 'queued': self.queue.qsize(), 'running': running,
+                                   'workers': self.workers})
+        else:
+            raise ValueError(f"Operación desconocida: {op}")
+    
+    async def worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.cancel_event.is_set():
+                    continue
+                job.started = True
+                await job.connection.send({'event': 'started', 'id': job.id})
+                try:
+                    deadline = time.time() + job.timeout if job.timeout else None
+                    result = await loop.run_in_executor(
+                        self.pool, run_job, job.id, job.puzzle, job.config, deadline, job.cancel_event,
+                        self.progress if job.progress else None)
+                except Exception as e:
+                    result = {'event': 'error', 'id': job.id, 'message': str(e)}
+                await job.connection.send(result)
+            finally:
+                self.jobs.pop(job.id, None)
+                self.queue.task_done()
+    
+    async def forward_progress(self):
+        """Reenvía a cada cliente los eventos de progreso que publican los procesos"""
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await loop.run_in_executor(None, self.progress.get)
+            if event is None:
+                break
+            job = self.jobs.get(event['id'])
+            if job is not None and not job.cancel_event.is_set():
+                await job.connection.send(event)
+    
+    async def serve(self, host='127.0.0.1', port=8765, path=None, ready=None):
+        """Arranca el servidor y atiende hasta que se cancela la tarea"""
+        # Con fork los procesos heredarían los sockets de los clientes y un cierre no llegaría al otro extremo
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                                              else 'spawn')
+        with multiprocessing.Manager() as manager, ProcessPoolExecutor(self.workers, mp_context=context) as pool:
+            self.manager, self.pool = manager, pool
+            self.progress = manager.Queue()
+            if path:
+                server = await asyncio.start_unix_server(self.handle_client, path)
+            else:
+                server = await asyncio.start_server(self.handle_client, host, port)
+            tasks = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+            tasks.append(asyncio.create_task(self.forward_progress()))
+            if ready is not None:
+                ready.set_result(server)
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                for job in self.jobs.values():
+                    job.cancel_event.set()
+                # Los manejadores de clientes usan los Event del Manager al terminar: se cierran
+                # y se esperan mientras el Manager sigue vivo
+                clients = list(self.clients)
+                for client in clients:
+                    client.cancel()
+                await asyncio.gather(*clients, return_exceptions=True)
+                self.progress.put(None)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio local de resolución de sudokus")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="Escuchar en este socket Unix en lugar de TCP")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Procesos en paralelo")
+    parser.add_argument('--queue-size', type=int, default=Config.SERVICE_QUEUE_SIZE,
+                        help="Trabajos en espera antes de rechazar peticiones")
+    parser.add_argument('--array', action='store_true', help="Usar la población en modo array")
+    parser.add_argument('--cache', default=Config.SOLUTION_CACHE_PATH,
+                        help="Fichero SQLite de soluciones compartido por todos los trabajos")
+    parser.add_argument('--solver', choices=['ga', 'exact', 'hybrid'], default=Config.SOLVER,
+                        help="Motor por defecto de los trabajos")
+    args = parser.parse_args(argv)
+    
+    config = Config()
+    config.ARRAY_POPULATION = args.array
+    config.SOLVER = args.solver
+    config.SOLUTION_CACHE_PATH = args.cache
+    service = SolveService(config, args.workers, args.queue_size)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Caché persistente de soluciones en SQLite, indexada por la forma canónica del puzzle.
+
+Los puzzles equivalentes bajo las simetrías del sudoku (ver symmetry.py)
+comparten entrada: se guarda la solución en la orientación canónica y, en un
+acierto, se devuelve transformada a la orientación de quien pregunta. Los
+puzzles con demasiados empates para canonizar (casi vacíos o muy simétricos)
+se indexan por el propio tablero y sólo aciertan con el mismo puzzle.
+"""
+import sqlite3
+import time
+import numpy as np
+from symmetry import canonical_form, apply_transform, invert_transform
+from sudoku import Sudoku, parse_board, format_board
+
+def is_solution(board, solution):
+    """Comprueba que la solución está completa, sin conflictos y respeta las pistas"""
+    givens = board > 0
+    return (solution.shape == board.shape and (solution > 0).all()
+            and np.array_equal(solution[givens], board[givens]) and Sudoku(board).is_solved(solution))
+
+class SolutionCache:
+    """Almacén puzzle canónico -> solución canónica en un fichero SQLite"""
+    
+    def __init__(self, path):
+        self.path = path
+        # Varios procesos (lotes, servicio) pueden compartir el fichero
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS solutions (
+                                       puzzle TEXT PRIMARY KEY,
+                                       solution TEXT NOT NULL,
+                                       size INTEGER NOT NULL,
+                                       created REAL NOT NULL
+                                   )''')
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+    
+    def key(self, board):
+        """Clave del tablero en la tabla y la transformación a su orientación.
+        
+        Es la forma canónica o, si canonical_form se rinde, el propio tablero con
+        la transformación identidad. Ambas son tableros equivalentes al puzzle,
+        así que pueden compartir tabla. Se calcula una vez y se pasa a lookup y store.
+        """
+        board = np.asarray(board)
+        canonical = canonical_form(board)
+        if canonical is None:
+            size = len(board)
+            return format_board(board), (False, np.arange(size), np.arange(size), np.arange(size + 1))
+        return format_board(canonical[0]), canonical[1]
+    
+    def lookup(self, board, key=None):
+        """Solución guardada para el tablero, en su orientación, o None si no hay.
+        
+        key es el resultado de self.key(board) (se calcula si no se da). La
+        solución devuelta se comprueba contra las pistas del tablero, de modo
+        que una entrada corrupta cuenta como fallo y no como acierto.
+        """
+        board = np.asarray(board)
+        puzzle, transform = key if key is not None else self.key(board)
+        row = self.connection.execute('SELECT solution FROM solutions WHERE puzzle = ?',
+                                      (puzzle,)).fetchone()
+        if row is not None:
+            solution = invert_transform(parse_board(row[0]), transform)
+            if is_solution(board, solution):
+                self.hits += 1
+                return solution
+        self.misses += 1
+        return None
+    
+    def store(self, board, solution, key=None):
+        """Guarda la solución si es válida para el tablero; devuelve si se guardó.
+        
+        key es, como en lookup, el resultado de self.key(board).
+        """
+        board, solution = np.asarray(board), np.asarray(solution)
+        if not is_solution(board, solution):
+            return False
+        puzzle, transform = key if key is not None else self.key(board)
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)',
+                                    (puzzle, format_board(apply_transform(solution, transform)),
+                                     len(board), time.time()))
+        return True
+    
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,51 @@
+"""Camino común de resolución de batch.py, service.py y benchmark.py: elección del
+motor según la configuración y consulta y guardado en la caché de soluciones"""
+import time
+from exact_solver import ExactSolver, HybridSolver
+from genetic_algorithm import GeneticAlgorithm
+from restarts import RestartScheduler
+from sudoku import format_board
+
+def solver_class(config):
+    """Clase del resolvedor que pide la configuración (SOLVER y RESTARTS)"""
+    if config.SOLVER == 'exact':
+        return ExactSolver
+    if config.SOLVER == 'hybrid':
+        return HybridSolver
+    if config.SOLVER == 'ga':
+        return RestartScheduler if config.RESTARTS else GeneticAlgorithm
+    raise ValueError(f"Resolvedor desconocido: {config.SOLVER}")
+
+def run_solver(sudoku, config, cache=None, callback=None, rng=None):
+    """Resuelve sudoku con el motor de solver_class(config), consultando antes cache.
+    
+    Es el camino común de batch.py y service.py. cache (una SolutionCache o
+    None) se indexa por las pistas originales y guarda las soluciones nuevas.
+    Devuelve solución en texto, solved, generaciones, conflictos y tiempo, más
+    'cached' en un acierto de la caché y 'engine' con el motor híbrido.
+    """
+    if cache is not None:
+        start = time.perf_counter()
+        # La clave canónica se calcula una sola vez para la consulta y el guardado
+        key = cache.key(sudoku.givens)
+        solution = cache.lookup(sudoku.givens, key)
+        if solution is not None:
+            return {'solution': format_board(solution), 'solved': True, 'generations': 0, 'conflicts': 0,
+                    'time': round(time.perf_counter() - start, 4), 'cached': True}
+    
+    solver = solver_class(config)(sudoku, config, callback=callback, rng=rng)
+    start = time.perf_counter()
+    solution = solver.solve()
+    conflicts = sudoku.count_conflicts(solution)
+    if cache is not None and conflicts == 0:
+        cache.store(sudoku.givens, solution, key)
+    result = {
+        'solution': format_board(solution),
+        'solved': conflicts == 0,
+        'generations': solver.generation,
+        'conflicts': int(conflicts),
+        'time': round(time.perf_counter() - start, 4)
+    }
+    if config.SOLVER == 'hybrid':
+        result['engine'] = solver.winner
+    return result
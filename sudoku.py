@@ -1,32 +1,261 @@
+from collections import OrderedDict
+from functools import lru_cache
+from math import isqrt
 import numpy as np
+from kernels import BACKENDS, resolve_backend
+
+# Símbolos de los dígitos 1..25 en la representación de una línea
+DIGIT_CHARS = '123456789ABCDEFGHIJKLMNOP'
+
+@lru_cache(maxsize=None)
+def build_units(box_size):
+    """Tablas de índices para un tablero de lado n = box_size²:
+    
+    - units: (3n, n) índices planos de las n filas, n columnas y n cajas.
+    - units_of_cell: (n², 3) las tres unidades (fila, columna, caja) de cada celda.
+    """
+    n = box_size * box_size
+    cells = np.arange(n * n).reshape(n, n)
+    rows = [cells[r] for r in range(n)]
+    cols = [cells[:, c] for c in range(n)]
+    boxes = [cells[r:r+box_size, c:c+box_size].flatten()
+             for r in range(0, n, box_size) for c in range(0, n, box_size)]
+    units = np.array(rows + cols + boxes)
+    
+    row_idx, col_idx = np.divmod(np.arange(n * n), n)
+    box_idx = row_idx // box_size * box_size + col_idx // box_size
+    units_of_cell = np.stack([row_idx, n + col_idx, 2 * n + box_idx], axis=1)
+    return units, units_of_cell
+
+def parse_board(text):
+    """Convierte una línea de n² caracteres ('0' o '.' para vacías) en un tablero n x n.
+    
+    Los dígitos mayores que 9 se escriben como letras (A = 10, B = 11, ...).
+    """
+    text = text.strip()
+    size = isqrt(len(text))
+    if size < 4 or size * size != len(text) or isqrt(size) ** 2 != size:
+        raise ValueError(f"Se esperaban n² caracteres con n = 9, 16 o 25; se recibieron {len(text)}")
+    values = []
+    for char in text.upper():
+        if char in '.0':
+            values.append(0)
+        elif char in DIGIT_CHARS[:size]:
+            values.append(DIGIT_CHARS.index(char) + 1)
+        else:
+            raise ValueError(f"Carácter no válido para un tablero {size}x{size}: {char!r}")
+    return np.array(values).reshape(size, size)
+
+def format_board(board):
+    """Representación en una línea de un tablero (vacías como '0')"""
+    return ''.join(DIGIT_CHARS[int(value) - 1] if value else '0'
+                   for value in np.asarray(board).flatten())
+
+# Máximo de rellenos legales que se enumeran por fila
+ROW_FILL_LIMIT = 10000
+# Máximo de nodos del backtracking de row_fills por fila: en filas dispersas de
+# 25x25 hay pocos rellenos completos pero millones de prefijos parciales
+ROW_FILL_NODE_LIMIT = 50000
 
 class Sudoku:
-    def __init__(self, board):
-        self.initial_board = np.array(board)
+    def __init__(self, board, cache_size=0):
+        # Los dígitos caben en un byte (hasta 25x25): los tableros derivados heredan uint8
+        self.initial_board = np.array(board, dtype=np.uint8)
+        self.size = len(self.initial_board)
+        self.box_size = isqrt(self.size)
+        if self.box_size ** 2 != self.size or self.initial_board.shape != (self.size, self.size):
+            raise ValueError(f"El tablero debe ser n x n con n cuadrado perfecto, no {self.initial_board.shape}")
+        self.units, self.units_of_cell = build_units(self.box_size)
+        self.n_units = len(self.units)
+        # Fitness de un tablero sin conflictos (243 en 9x9)
+        self.max_fitness = self.n_units * self.size
+        # Máscara con los bits 1..n activos: todos los dígitos posibles
+        self.all_digits = (1 << (self.size + 1)) - 2
+        
+        # Pistas originales: propagate_constraints sólo cambia initial_board, fixed_positions y candidates
+        self.givens = self.initial_board.copy()
+        self.given_positions = self.givens != 0
         self.fixed_positions = self.initial_board != 0
+        self.candidates = self.compute_candidates(self.initial_board)
+        self._row_fills = {}
+        self.set_cache_size(cache_size)
+        # Backend de los núcleos de conflictos y cuentas (kernels.py); se guarda por nombre
+        self.backend = resolve_backend('auto')
+    
+    @property
+    def kernels(self):
+        return BACKENDS[self.backend]
+    
+    def set_backend(self, name):
+        """Elige el backend de los núcleos: 'auto', 'numba' o 'numpy'"""
+        self.backend = resolve_backend(name)
+    
+    def set_cache_size(self, cache_size):
+        """Activa (cache_size > 0) o desactiva la caché LRU de fitness y reinicia sus estadísticas"""
+        self.cache_size = cache_size
+        self._fitness_cache = OrderedDict() if cache_size > 0 else None
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def cache_info(self):
+        """Estadísticas de la caché de fitness"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._fitness_cache) if self._fitness_cache is not None else 0,
+            'max_size': self.cache_size,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0
+        }
+    
+    def compute_candidates(self, board):
+        """Máscara de bits de candidatos legales por celda (bit d = dígito d).
         
-    def count_conflicts(self, board):
-        conflicts = 0
+        Las celdas ocupadas tienen como único candidato su propio valor.
+        """
+        board = np.asarray(board)
+        bits = np.left_shift(1, board.astype(np.int64))
+        # Dígitos presentes en cada unidad (el bit 0 corresponde a las vacías)
+        used = np.bitwise_or.reduce(bits.reshape(-1)[self.units], axis=1)
+        used_by_cell = np.bitwise_or.reduce(used[self.units_of_cell], axis=1).reshape(board.shape)
+        return np.where(board != 0, bits, self.all_digits & ~used_by_cell)
+    
+    def propagate_constraints(self):
+        """Propagación de singles desnudos y ocultos.
+        
+        Las celdas forzadas pasan a ser fijas (initial_board y fixed_positions)
+        y se actualizan los candidatos; givens y given_positions no cambian.
+        Devuelve el número de celdas forzadas.
+        """
+        board = self.initial_board.copy()
+        forced = 0
+        contradiction = False
+        
+        while not contradiction:
+            candidates = self.compute_candidates(board)
+            flat = candidates.reshape(-1)
+            values = board.reshape(-1)
+            assignments = {}
+            
+            # Contradicción: una celda vacía sin candidatos
+            if ((values == 0) & (flat == 0)).any():
+                contradiction = True
+                break
+            
+            # Singles desnudos: celda con un único candidato
+            for cell in np.flatnonzero(values == 0):
+                mask = int(flat[cell])
+                if mask & (mask - 1) == 0:
+                    assignments[cell] = mask.bit_length() - 1
+            
+            # Singles ocultos: dígito que sólo cabe en una celda de la unidad
+            for unit in self.units:
+                empty = unit[values[unit] == 0]
+                missing = self.all_digits & ~np.bitwise_or.reduce(np.left_shift(1, values[unit].astype(np.int64)))
+                for digit in range(1, self.size + 1):
+                    cells = empty[(flat[empty] >> digit) & 1 == 1]
+                    if len(cells) == 1:
+                        assignments.setdefault(cells[0], digit)
+                    elif len(cells) == 0 and (missing >> digit) & 1:
+                        # Contradicción: un dígito que falta en la unidad no cabe en ninguna celda
+                        contradiction = True
+            
+            if contradiction or not assignments:
+                break
+            for cell, digit in assignments.items():
+                values[cell] = digit
+            forced += len(assignments)
+            
+            # Contradicción: dos singles ponen el mismo dígito en una unidad
+            contradiction = bool((self.unit_counts(board)[:, 1:] > 1).any())
+        
+        if contradiction:
+            board = self.initial_board.copy()
+            forced = 0
+        
+        self.initial_board = board
+        self.fixed_positions = board != 0
+        self.candidates = self.compute_candidates(board)
+        self._row_fills = {}
+        return forced
+    
+    def row_fills(self, row):
+        """Todas las formas legales de rellenar las celdas vacías de una fila.
+        
+        Devuelve un array (m, k) con los valores para las k celdas vacías en
+        orden de columna, o None si no hay ninguna, si hay más de ROW_FILL_LIMIT
+        o si la búsqueda visita más de ROW_FILL_NODE_LIMIT nodos.
+        """
+        if row in self._row_fills:
+            return self._row_fills[row]
         
-        # Conflictos en filas
-        for row in board:
-            conflicts += (9 - len(set(row)))
+        empty_cols = np.flatnonzero(~self.fixed_positions[row])
+        masks = [int(self.candidates[row, col]) for col in empty_cols]
+        fills = []
+        nodes = 0
         
-        # Conflictos en columnas
-        for col in range(9):
-            conflicts += (9 - len(set(board[:, col])))
+        def backtrack(i, used, current):
+            nonlocal nodes
+            nodes += 1
+            if len(fills) > ROW_FILL_LIMIT or nodes > ROW_FILL_NODE_LIMIT:
+                return
+            if i == len(masks):
+                fills.append(list(current))
+                return
+            # Sólo los candidatos de la celda que la fila aún no usa
+            available = masks[i] & ~used
+            while available:
+                bit = available & -available
+                available ^= bit
+                current.append(bit.bit_length() - 1)
+                backtrack(i + 1, used | bit, current)
+                current.pop()
         
-        # Conflictos en subcuadrículas 3x3
-        for box_row in range(0, 9, 3):
-            for box_col in range(0, 9, 3):
-                box = board[box_row:box_row+3, box_col:box_col+3].flatten()
-                conflicts += (9 - len(set(box)))
+        backtrack(0, 0, [])
+        result = None
+        if 0 < len(fills) <= ROW_FILL_LIMIT and nodes <= ROW_FILL_NODE_LIMIT:
+            result = np.array(fills, dtype=self.initial_board.dtype).reshape(len(fills), len(masks))
+        self._row_fills[row] = result
+        return result
+    
+    def allowed(self, rows, cols, values):
+        """Indica (vectorizado) si cada valor es candidato legal en su celda"""
+        return (self.candidates[rows, cols] >> values) & 1 == 1
         
-        return conflicts
+    def count_conflicts(self, board):
+        """Conflictos de un tablero: suma sobre filas, columnas y cajas de n - valores distintos"""
+        return int(self.count_conflicts_batch(np.asarray(board)[np.newaxis])[0])
+    
+    def count_conflicts_batch(self, boards):
+        """Conflictos de N tableros (N, n, n) con el backend de núcleos elegido"""
+        boards = np.asarray(boards)
+        return self.kernels.count_conflicts(boards.reshape(len(boards), -1), self.units, self.size)
+    
+    def unit_counts(self, board):
+        """Cuenta de cada dígito (0..n) en cada unidad: array (3n, n + 1)"""
+        return self.kernels.unit_counts(np.asarray(board).reshape(-1), self.units, self.size)
     
     def fitness(self, board):
-        conflicts = self.count_conflicts(board)
-        return 243 - conflicts
+        if self._fitness_cache is None:
+            return self.max_fitness - self.count_conflicts(board)
+        
+        # Clave compacta: un byte por celda
+        key = np.asarray(board, dtype=np.uint8).tobytes()
+        cache = self._fitness_cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return cache[key]
+        
+        self.cache_misses += 1
+        value = self.max_fitness - self.count_conflicts(board)
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+    
+    def fitness_batch(self, boards):
+        return self.max_fitness - self.count_conflicts_batch(boards)
     
     def is_solved(self, board):
-        return self.count_conflicts(board) == 0
\ No newline at end of file
+        return self.count_conflicts(board) == 0
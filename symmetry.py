@@ -0,0 +1,127 @@
+"""Forma canónica de un sudoku bajo sus simetrías.
+
+Dos puzzles son equivalentes si uno se obtiene del otro reetiquetando los
+dígitos, trasponiendo y permutando filas dentro de una banda, columnas dentro
+de una pila, bandas y pilas. La forma canónica es el representante
+lexicográficamente mínimo (por filas, con las vacías como 0 y los dígitos
+reetiquetados por orden de aparición), de modo que todos los puzzles
+equivalentes comparten la misma.
+"""
+from functools import lru_cache
+from itertools import permutations, product
+from math import factorial, isqrt
+import numpy as np
+
+# Por encima de este número de órdenes de columnas (16x16 en adelante) sólo se
+# canoniza bajo reetiquetado y permutaciones de filas, bandas y pilas de filas
+COLUMN_ORDER_LIMIT = 10000
+
+# Máximo de estados empatados que se amplían en un paso: en puzzles casi vacíos
+# o muy simétricos empata casi todo el grupo y el coste se dispara
+TIE_LIMIT = 20000
+
+@lru_cache(maxsize=None)
+def line_orders(box_size):
+    """Todas las permutaciones de n líneas que respetan los grupos de box_size (m, n)"""
+    groups = list(permutations(range(box_size)))
+    orders = [[band * box_size + row for band, rows in zip(band_order, row_orders) for row in rows]
+              for band_order in groups
+              for row_orders in product(groups, repeat=box_size)]
+    return np.array(orders)
+
+def relabel(values, labels, next_label):
+    """Reetiqueta por orden de aparición, fila a fila y en paralelo para k estados.
+    
+    values (k, n) se traduce con labels (k, n + 1), que se completa (junto con
+    next_label) con los dígitos que aparecen por primera vez. El 0 queda como 0.
+    """
+    k = len(values)
+    index = np.arange(k)
+    for j in range(values.shape[1]):
+        digits = values[:, j]
+        new = (digits > 0) & (labels[index, digits] == 0)
+        labels[index[new], digits[new]] = next_label[new]
+        next_label[new] += 1
+    return labels[index[:, np.newaxis], values]
+
+def canonical_form(board, tie_limit=TIE_LIMIT):
+    """Forma canónica del tablero y la transformación que lleva a ella.
+    
+    La transformación es (transpuesto, rows, cols, labels): la celda (i, j) de
+    la forma canónica es labels[B[rows[i], cols[j]]], con B el tablero (o su
+    traspuesta). Los estados que empatan con el mínimo se amplían fila a fila
+    y el resto se descarta, así que el coste depende de los empates del
+    puzzle y no del tamaño del grupo. Si en algún paso empatan más de
+    tie_limit estados (None = sin límite) se abandona y devuelve None.
+    """
+    board = np.asarray(board, dtype=np.int64)
+    size = len(board)
+    box_size = isqrt(size)
+    
+    full_group = factorial(box_size) ** (box_size + 1) <= COLUMN_ORDER_LIMIT
+    col_orders = line_orders(box_size) if full_group else np.arange(size)[np.newaxis]
+    oriented = np.stack([board, board.T]) if full_group else board[np.newaxis]
+    
+    # Estado: orientación, orden de columnas, filas elegidas y etiquetas asignadas
+    transposed, cols = (a.ravel() for a in np.meshgrid(np.arange(len(oriented)), np.arange(len(col_orders)),
+                                                      indexing='ij'))
+    rows = np.zeros((len(cols), 0), dtype=np.int64)
+    labels = np.zeros((len(cols), size + 1), dtype=np.int64)
+    next_label = np.ones(len(cols), dtype=np.int64)
+    bands = np.arange(size) // box_size
+    
+    for i in range(size):
+        # Filas candidatas: al empezar banda, cualquiera de una banda no usada; si no, las de la banda actual
+        used = np.zeros((len(rows), size), dtype=bool)
+        used[np.arange(len(rows))[:, np.newaxis], rows] = True
+        if i % box_size == 0:
+            used_bands = used.reshape(len(rows), box_size, box_size).any(axis=2)
+            allowed = ~used_bands[:, bands]
+        else:
+            current_band = rows[:, i - i % box_size] // box_size
+            allowed = (bands == current_band[:, np.newaxis]) & ~used
+        state, row = np.nonzero(allowed)
+        
+        values = oriented[transposed[state], row][np.arange(len(state))[:, np.newaxis], col_orders[cols[state]]]
+        state_labels = labels[state]
+        state_next = next_label[state]
+        output = relabel(values, state_labels, state_next)
+        
+        # Quedarse con los candidatos cuya fila es lexicográficamente mínima
+        keep = np.ones(len(state), dtype=bool)
+        for j in range(size):
+            column = output[:, j]
+            keep &= column == column[keep].min()
+        
+        state = state[keep]
+        if tie_limit is not None and len(state) > tie_limit:
+            return None
+        transposed, cols = transposed[state], cols[state]
+        rows = np.column_stack([rows[state], row[keep]])
+        labels, next_label = state_labels[keep], state_next[keep]
+    
+    # Los dígitos ausentes del puzzle reciben las etiquetas libres en orden
+    mapping = labels[0]
+    free = iter(range(next_label[0], size + 1))
+    for digit in range(1, size + 1):
+        if mapping[digit] == 0:
+            mapping[digit] = next(free)
+    
+    transform = (bool(transposed[0]), rows[0], col_orders[cols[0]], mapping)
+    return apply_transform(board, transform), transform
+
+def apply_transform(board, transform):
+    """Aplica a un tablero (p. ej. la solución) la transformación de canonical_form"""
+    transposed, rows, cols, labels = transform
+    board = np.asarray(board)
+    oriented = board.T if transposed else board
+    return labels[oriented[np.ix_(rows, cols)]]
+
+def invert_transform(board, transform):
+    """Deshace apply_transform: devuelve el tablero a la orientación original"""
+    transposed, rows, cols, labels = transform
+    inverse = np.zeros_like(labels)
+    inverse[labels] = np.arange(len(labels))
+    oriented = np.zeros_like(board)
+    oriented[np.ix_(rows, cols)] = inverse[np.asarray(board)]
+    return oriented.T if transposed else oriented
@@ -0,0 +1,43 @@
+"""Equivalencia de los backends de núcleos: mismos resultados y misma ejecución con una semilla"""
+import numpy as np
+import pytest
+from config import Config
+from genetic_algorithm import GeneticAlgorithm
+from history import History
+from kernels import BACKENDS, KERNEL_NAMES, check_backends
+from puzzles import EXAMPLES
+from sudoku import Sudoku
+
+def test_kernels_match():
+    # Sin numba se comparan con las versiones por bucles sin compilar
+    results = check_backends(box_sizes=(2, 3, 4), n_boards=20, seed=1)
+    assert set(results) == set(KERNEL_NAMES)
+    mismatched = [kernel for kernel, (same, _, _) in results.items() if not same]
+    assert not mismatched
+
+def solve_with_backend(backend, array_population, incremental):
+    config = Config()
+    config.KERNEL_BACKEND = backend
+    config.ARRAY_POPULATION = array_population
+    config.INCREMENTAL_FITNESS = incremental
+    config.POPULATION_SIZE = 200
+    config.GENERATIONS = 40
+    config.SEED = 7
+    config.VERBOSE = False
+    config.REALTIME_VISUALIZATION = False
+    ga = GeneticAlgorithm(Sudoku(EXAMPLES['medio']), config)
+    solution = ga.solve()
+    return ga, solution
+
+@pytest.mark.parametrize('array_population, incremental', [(False, False), (False, True), (True, False)])
+def test_seeded_solve_same_history(array_population, incremental):
+    pytest.importorskip('numba')
+    assert 'numba' in BACKENDS
+    ga_numpy, solution_numpy = solve_with_backend('numpy', array_population, incremental)
+    ga_numba, solution_numba = solve_with_backend('numba', array_population, incremental)
+    assert ga_numpy.generation == ga_numba.generation
+    # Todo salvo el tiempo transcurrido
+    for field, _ in History.FIELDS:
+        if field != 'elapsed':
+            assert np.array_equal(ga_numpy.history[field], ga_numba.history[field], equal_nan=True), field
+    assert np.array_equal(solution_numpy, solution_numba)
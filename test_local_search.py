@@ -0,0 +1,18 @@
+"""Búsqueda tabú del modo memético: los conflictos devueltos son los del tablero"""
+import numpy as np
+from local_search import TabuSearch
+from puzzles import EXAMPLES
+from sudoku import Sudoku
+
+def test_improve_with_duplicate_in_row():
+    sudoku = Sudoku(EXAMPLES['medio'])
+    free = np.flatnonzero(~sudoku.fixed_positions[0])
+    for seed in range(50):
+        board = sudoku.initial_board.copy()
+        rng = np.random.default_rng(seed)
+        board[~sudoku.fixed_positions] = rng.integers(1, 10, (~sudoku.fixed_positions).sum())
+        # La fila 0 repite un dígito en dos celdas libres, como tras un intercambio entre filas
+        board[0, free[1]] = board[0, free[0]]
+        search = TabuSearch(sudoku, use_candidates=False, rng=rng)
+        improved, conflicts = search.improve(board, 50)
+        assert conflicts == sudoku.count_conflicts(improved)
@@ -0,0 +1,27 @@
+"""Reinicios con parámetros variados y élites conservadas entre intentos"""
+import pytest
+from config import Config
+from puzzles import EXAMPLES
+from restarts import RestartScheduler
+from sudoku import Sudoku
+
+@pytest.mark.parametrize('array_population', [False, True])
+def test_carry_elites_into_smaller_attempt(array_population):
+    config = Config()
+    config.RESTARTS = True
+    config.RESTART_VARY_PARAMS = True
+    # Tantas élites como población: un intento más pequeño recibe más de las que caben
+    config.RESTART_CARRY_ELITES = 100
+    config.RESTART_BASE = 5
+    config.POPULATION_SIZE = 100
+    config.GENERATIONS = 60
+    config.ARRAY_POPULATION = array_population
+    config.SEED = 2
+    config.VERBOSE = False
+    config.REALTIME_VISUALIZATION = False
+    scheduler = RestartScheduler(Sudoku(EXAMPLES['medio']), config)
+    scheduler.solve()
+    populations = [attempt['population'] for attempt in scheduler.attempts]
+    # Con esta semilla un intento de 200 lleva 100 élites a uno de 50
+    assert any(later * 4 <= earlier for earlier, later in zip(populations, populations[1:]))
+    assert scheduler.generation == config.GENERATIONS
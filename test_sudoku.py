@@ -0,0 +1,32 @@
+"""Preprocesado del tablero: propagación de restricciones y enumeración de rellenos por fila"""
+import time
+import numpy as np
+from config import Config
+from genetic_algorithm import GeneticAlgorithm
+from puzzles import generate_puzzle
+from sudoku import Sudoku, parse_board
+
+def test_contradictory_singles_restore_board():
+    # Sin duplicados en las pistas, pero dos singles forzados chocan en una unidad con vacías
+    sudoku = Sudoku(parse_board('4001000000130400'))
+    assert sudoku.propagate_constraints() == 0
+    assert np.array_equal(sudoku.initial_board, sudoku.givens)
+    assert np.array_equal(sudoku.fixed_positions, sudoku.given_positions)
+
+def test_row_fills_bounded_on_sparse_25x25():
+    # Con 400 vacías la búsqueda sin límite de nodos tardaba más de dos minutos
+    sudoku = Sudoku(generate_puzzle(5, holes=400, rng=np.random.default_rng(0)))
+    sudoku.propagate_constraints()
+    config = Config()
+    config.SEED = 0
+    config.VERBOSE = False
+    config.REALTIME_VISUALIZATION = False
+    ga = GeneticAlgorithm(sudoku, config)
+    start = time.perf_counter()
+    boards = ga.random_boards(10)
+    assert time.perf_counter() - start < 30
+    # Sin rellenos enumerados cada fila sigue siendo una permutación
+    digits = np.arange(1, sudoku.size + 1)
+    assert all(np.array_equal(np.sort(row), digits) for board in boards for row in board)
+    assert np.array_equal(boards[:, sudoku.fixed_positions],
+                          np.broadcast_to(sudoku.initial_board[sudoku.fixed_positions], (10, sudoku.fixed_positions.sum())))
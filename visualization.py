@@ -1,80 +1,167 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.animation import FuncAnimation
+from config import Config
+from sudoku import DIGIT_CHARS
 
 class RealtimeVisualizer:
-    def __init__(self, sudoku):
+    """Visualización en vivo con coste por fotograma constante.
+    
+    Los artistas (línea de conflictos, dígitos y título) se crean una sola vez
+    y se actualizan con set_data/set_text. Con blitting se guarda el fondo
+    estático tras cada redibujado completo y en cada fotograma sólo se
+    restauran y redibujan la zona de la gráfica y las celdas que cambiaron.
+    El histórico se diezma a la mitad al llenar Config.VISUALIZATION_MAX_POINTS.
+    """
+    
+    def __init__(self, sudoku, config=Config()):
         self.sudoku = sudoku
+        self.size = sudoku.size
         self.fig = plt.figure(figsize=(14, 6))
+        canvas = self.fig.canvas
+        self.blit = config.VISUALIZATION_BLIT and canvas.supports_blit and hasattr(canvas, 'copy_from_bbox')
         
         # Subplot para el tablero
         self.ax_board = self.fig.add_subplot(121)
-        self.ax_board.set_xlim(0, 9)
-        self.ax_board.set_ylim(0, 9)
+        self.ax_board.set_xlim(0, self.size)
+        self.ax_board.set_ylim(0, self.size)
         self.ax_board.set_aspect('equal')
         self.ax_board.axis('off')
         
         # Subplot para las gráficas
         self.ax_stats = self.fig.add_subplot(122)
+        self.ax_stats.set_xlabel('Generación', fontsize=12)
+        self.ax_stats.set_ylabel('Conflictos', fontsize=12)
+        self.ax_stats.grid(True, alpha=0.3)
+        self.ax_stats.set_xlim(0, 100)
+        self.ax_stats.set_ylim(0, 1)
+        self.line, = self.ax_stats.plot([], [], 'r-', linewidth=2, label='Conflictos', animated=self.blit)
+        self.ax_stats.legend(loc='upper right')
+        self.title = self.ax_stats.text(0.5, 1.02, '', transform=self.ax_stats.transAxes,
+                                        ha='center', va='bottom', fontsize=12, weight='bold',
+                                        animated=self.blit)
         
-        self.generations = []
-        self.fitness_vals = []
-        self.conflicts_vals = []
+        # Histórico diezmado: se guarda un punto de cada stride actualizaciones
+        self.max_points = config.VISUALIZATION_MAX_POINTS
+        self.generations = np.zeros(self.max_points)
+        self.conflicts_vals = np.zeros(self.max_points)
+        self.n_points = 0
+        self.stride = 1
+        self.updates = 0
         
         self.draw_grid()
         self.text_objects = []
         self.init_text_objects()
         
+        self.background = None
+        canvas.mpl_connect('draw_event', self.on_draw)
+        
         plt.ion()
         plt.show()
+        canvas.draw()
     
     def draw_grid(self):
-        for i in range(10):
-            lw = 3 if i % 3 == 0 else 1
-            self.ax_board.plot([0, 9], [i, i], 'k-', linewidth=lw)
-            self.ax_board.plot([i, i], [0, 9], 'k-', linewidth=lw)
+        draw_grid(self.ax_board, self.size, self.sudoku.box_size)
     
     def init_text_objects(self):
         self.text_objects = []
-        for i in range(9):
+        for i in range(self.size):
             row_texts = []
-            for j in range(9):
-                text = self.ax_board.text(j + 0.5, 8.5 - i, '', 
+            for j in range(self.size):
+                text = self.ax_board.text(j + 0.5, self.size - 0.5 - i, '', 
                                          ha='center', va='center', 
-                                         fontsize=18)
+                                         fontsize=font_size(self.size, 18), animated=self.blit)
                 row_texts.append(text)
             self.text_objects.append(row_texts)
+        self.shown = np.zeros((self.size, self.size), dtype=int)
+    
+    def on_draw(self, event):
+        """Tras un redibujado completo (inicio, cambio de ejes, resize) se guarda el fondo
+        sin los artistas animados y se recalculan las zonas en píxeles a restaurar"""
+        if not self.blit:
+            return
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        
+        # restore_region recibe píxeles del buffer (origen arriba a la izquierda);
+        # con xy=(0, 0), la esquina del fondo guardado, que cubre toda la figura
+        height = self.fig.bbox.height
+        corners = self.ax_board.transData.transform(
+            [(j, self.size - i) for i in range(self.size + 1) for j in range(self.size + 1)]
+        ).reshape(self.size + 1, self.size + 1, 2)
+        corners[:, :, 1] = height - corners[:, :, 1]
+        self.cell_extents = [[(np.floor(corners[i, j, 0]), np.floor(corners[i, j, 1]),
+                               np.ceil(corners[i + 1, j + 1, 0]), np.ceil(corners[i + 1, j + 1, 1]))
+                              for j in range(self.size)] for i in range(self.size)]
+        # Zona de la gráfica más el título, hasta el borde superior de la figura
+        stats = self.ax_stats.bbox
+        self.stats_extents = (np.floor(stats.x0), 0, np.ceil(stats.x1), np.ceil(height - stats.y0))
+        
+        for row_texts in self.text_objects:
+            for text in row_texts:
+                self.ax_board.draw_artist(text)
+        self.ax_stats.draw_artist(self.line)
+        self.ax_stats.draw_artist(self.title)
+    
+    def record(self, generation, conflicts):
+        """Añade un punto al histórico, diezmándolo cuando se llena"""
+        self.updates += 1
+        if (self.updates - 1) % self.stride:
+            return
+        if self.n_points == self.max_points:
+            # Se conservan los puntos de índice par (el último incluido si max_points es impar)
+            half = (self.max_points + 1) // 2
+            self.generations[:half] = self.generations[:self.max_points:2]
+            self.conflicts_vals[:half] = self.conflicts_vals[:self.max_points:2]
+            self.n_points = half
+            self.stride *= 2
+            # Con max_points impar el punto actual no cae en la rejilla del nuevo paso
+            if (self.updates - 1) % self.stride:
+                return
+        self.generations[self.n_points] = generation
+        self.conflicts_vals[self.n_points] = conflicts
+        self.n_points += 1
     
     def update(self, ga):
         board = ga.best_individual.board
+        fitness = ga.best_individual.fitness
+        conflicts = self.sudoku.max_fitness - fitness
+        canvas = self.fig.canvas
         
-        # Actualizar tablero
-        for i in range(9):
-            for j in range(9):
-                num = board[i, j]
-                if num != 0:
-                    is_fixed = self.sudoku.fixed_positions[i, j]
-                    color = 'black' if is_fixed else 'blue'
-                    weight = 'bold' if is_fixed else 'normal'
-                    self.text_objects[i][j].set_text(str(num))
-                    self.text_objects[i][j].set_color(color)
-                    self.text_objects[i][j].set_weight(weight)
+        # Actualizar sólo las celdas cuyo valor ha cambiado
+        fixed = self.sudoku.given_positions
+        changed = np.argwhere(board != self.shown)
+        for i, j in changed:
+            num = board[i, j]
+            text = self.text_objects[i][j]
+            text.set_text(DIGIT_CHARS[num - 1] if num else '')
+            text.set_color('black' if fixed[i, j] else 'blue')
+            text.set_weight('bold' if fixed[i, j] else 'normal')
+        self.shown = board.copy()
         
         # Actualizar gráficas
-        self.generations.append(ga.generation)
-        self.fitness_vals.append(ga.best_individual.fitness)
-        self.conflicts_vals.append(self.sudoku.count_conflicts(board))
-        
-        self.ax_stats.clear()
-        self.ax_stats.plot(self.generations, self.conflicts_vals, 'r-', linewidth=2, label='Conflictos')
-        self.ax_stats.set_xlabel('Generación', fontsize=12)
-        self.ax_stats.set_ylabel('Conflictos', fontsize=12)
-        self.ax_stats.set_title(f'Gen: {ga.generation} | Fitness: {ga.best_individual.fitness} | Conflictos: {self.conflicts_vals[-1]}', 
-                               fontsize=12, weight='bold')
-        self.ax_stats.grid(True, alpha=0.3)
-        self.ax_stats.legend()
+        self.record(ga.generation, conflicts)
+        n = self.n_points
+        self.line.set_data(self.generations[:n], self.conflicts_vals[:n])
+        self.title.set_text(f'Gen: {ga.generation} | Fitness: {fitness} | Conflictos: {conflicts}')
         
-        plt.pause(0.001)
+        # Ampliar los ejes al doble cuando los datos se salen (redibujado completo amortizado)
+        x_max = self.ax_stats.get_xlim()[1]
+        y_max = self.ax_stats.get_ylim()[1]
+        if ga.generation > x_max or conflicts > y_max:
+            self.ax_stats.set_xlim(0, max(x_max, 2 * ga.generation))
+            self.ax_stats.set_ylim(0, max(y_max, 1.2 * conflicts))
+            canvas.draw()
+        elif self.blit and self.background is not None:
+            for i, j in changed:
+                canvas.restore_region(self.background, bbox=self.cell_extents[i][j], xy=(0, 0))
+                self.ax_board.draw_artist(self.text_objects[i][j])
+            canvas.restore_region(self.background, bbox=self.stats_extents, xy=(0, 0))
+            self.ax_stats.draw_artist(self.line)
+            self.ax_stats.draw_artist(self.title)
+            canvas.blit(self.fig.bbox)
+        else:
+            canvas.draw_idle()
+        canvas.flush_events()
         
         return True  # Continuar ejecución
 
@@ -84,17 +171,15 @@ def plot_final_results(sudoku, solution, history):
     
     # Sudoku inicial
     ax1 = fig.add_subplot(131)
-    plot_static_sudoku(ax1, sudoku.initial_board, "Sudoku Inicial", sudoku.fixed_positions)
+    plot_static_sudoku(ax1, sudoku.givens, "Sudoku Inicial", sudoku.given_positions)
     
     # Solución
     ax2 = fig.add_subplot(132)
-    plot_static_sudoku(ax2, solution, "Solución", sudoku.fixed_positions)
+    plot_static_sudoku(ax2, solution, "Solución", sudoku.given_positions)
     
     # Evolución
     ax3 = fig.add_subplot(133)
-    generations = [h['generation'] for h in history]
-    conflicts = [h['conflicts'] for h in history]
-    ax3.plot(generations, conflicts, 'r-', linewidth=2)
+    ax3.plot(history['generation'], history['conflicts'], 'r-', linewidth=2)
     ax3.set_xlabel('Generación')
     ax3.set_ylabel('Conflictos')
     ax3.set_title('Evolución de Conflictos')
@@ -103,25 +188,34 @@ def plot_final_results(sudoku, solution, history):
     plt.tight_layout()
     return fig
 
+def draw_grid(ax, size, box_size):
+    """Líneas del tablero, más gruesas en los bordes de las cajas"""
+    for i in range(size + 1):
+        lw = 3 if i % box_size == 0 else 1
+        ax.plot([0, size], [i, i], 'k-', linewidth=lw)
+        ax.plot([i, i], [0, size], 'k-', linewidth=lw)
+
+def font_size(size, base):
+    """Tamaño de letra escalado para que los dígitos quepan en tableros grandes"""
+    return max(6, base * 9 // size)
+
 def plot_static_sudoku(ax, board, title, fixed_positions=None):
-    ax.set_xlim(0, 9)
-    ax.set_ylim(0, 9)
+    size = len(board)
+    ax.set_xlim(0, size)
+    ax.set_ylim(0, size)
     ax.set_aspect('equal')
     ax.axis('off')
     
-    for i in range(10):
-        lw = 3 if i % 3 == 0 else 1
-        ax.plot([0, 9], [i, i], 'k-', linewidth=lw)
-        ax.plot([i, i], [0, 9], 'k-', linewidth=lw)
+    draw_grid(ax, size, int(np.sqrt(size)))
     
-    for i in range(9):
-        for j in range(9):
+    for i in range(size):
+        for j in range(size):
             num = board[i, j]
             if num != 0:
                 color = 'black' if fixed_positions is None or fixed_positions[i, j] else 'blue'
                 weight = 'bold' if fixed_positions is None or fixed_positions[i, j] else 'normal'
-                ax.text(j + 0.5, 8.5 - i, str(num), 
+                ax.text(j + 0.5, size - 0.5 - i, DIGIT_CHARS[num - 1], 
                        ha='center', va='center', 
-                       fontsize=16, color=color, weight=weight)
+                       fontsize=font_size(size, 16), color=color, weight=weight)
     
     ax.set_title(title, fontsize=14, weight='bold')
\ No newline at end of file